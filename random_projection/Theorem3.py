@@ -0,0 +1,156 @@
+import random
+import math
+import logging
+import numpy as np
+from .adaptive import AdaptiveSweep
+from .ensemble import BrainEnsemble
+
+
+
+def compute_expression(n, k, a):
+    """
+    Computes the theoretical expression provided by Theorem 3.
+
+    :param n: Total number of neurons per area.
+    :param k: Size of the assembly.
+    :param a: Alpha, representing the fraction of overlapping nodes between two stimuli.
+    :return: The computed theoretical overlap value.
+    """
+    term1 = math.pow(math.log(n/k), a/(1+a))
+    term1=1/term1
+
+    term2 = k/n
+    term3 = (1-a)/(1+a)
+
+    result = term1 * (term2 ** term3)
+    return result
+
+def make_stimuli(n, k, alpha, seed):
+    """
+    Draws two stimuli of k neurons that share a fraction alpha of their neurons.
+
+    :param n: Total number of neurons per area.
+    :param k: Size of the assembly.
+    :param alpha: Fraction of overlapping nodes between two stimuli.
+    :param seed: Seed for random number generator.
+    :return: The neuron_IDs of both stimuli.
+    """
+    generator = random.Random(seed)
+    stimulus1 = generator.sample(range(n), k)
+    shared = generator.sample(stimulus1, min(k, math.ceil(alpha*k)))
+    outside = sorted(set(range(n)) - set(stimulus1))
+    stimulus2 = shared + generator.sample(outside, k - len(shared))
+    return stimulus1, stimulus2
+
+
+def run_batch(n, k, alphas, seeds):
+    """
+    Runs the model once for every pair of alpha and seed, all in one BrainEnsemble.
+
+    Every trial projects its stimuli from area 0 into area 1 of the Brain with its seed.
+
+    :param n: Total number of neurons per area.
+    :param k: Size of the assembly.
+    :param alphas: Fraction of overlapping nodes between two stimuli of every trial.
+    :param seeds: Seed of every trial.
+    :return: A list with [overlap, expected_overlap] for every trial.
+    """
+    Ensemble = BrainEnsemble(seeds,
+                             num_brain_areas=2,
+                             neurons_per_area=n,
+                             vertice_probability=0.05,
+                             assemblie_size=k,
+                             plasticity=0.3,
+                             area_vertice_probability=1
+                             )
+    Area1, Area2 = Ensemble.brain_areas
+    stimuli = [make_stimuli(n, k, alpha, seed) for alpha, seed in zip(alphas, seeds)]
+
+    Area1.assemblie_fire_custom(np.array([stimulus1 for stimulus1, _ in stimuli]))
+    k_cap_stim_1 = Area2.make_k_cap(k)
+    Ensemble.reset()
+
+    Area1.assemblie_fire_custom(np.array([stimulus2 for _, stimulus2 in stimuli]))
+    k_cap_stim_2 = Area2.make_k_cap(k)
+    Ensemble.reset()
+
+    in_cap_1 = np.zeros((len(seeds), n), dtype=bool)
+    np.put_along_axis(in_cap_1, k_cap_stim_1, True, axis=1)
+    overlaps = np.take_along_axis(in_cap_1, k_cap_stim_2, axis=1).sum(axis=1)/k
+    return [[overlap, compute_expression(n,k,alpha)] for overlap, alpha in zip(overlaps, alphas)]
+
+
+def run_experiment(n=2000, k=100, points=101, target_half_width=0.03, max_trials_per_point=3, batch_size=16):
+    """
+    Computes the theoretical bound and the empirical overlap for alpha values from 0 to 1.
+
+    The trials are allocated adaptively: every alpha value gets a few trials, and further trials go
+    to the alpha values where the confidence interval of the empirical overlap is widest or the
+    curve bends most, until the intervals are narrow enough or the trial budget is spent.
+
+    :param n: Total number of neurons per area.
+    :param k: Size of the assembly.
+    :param points: Number of alpha values, at least 2 so that both 0 and 1 are included.
+    :param target_half_width: Half-width of the confidence interval at which an alpha value is precise enough.
+    :param max_trials_per_point: Trial budget, as the average number of trials per alpha value.
+    :param batch_size: Number of trials run together in one BrainEnsemble.
+    :return: dict with the parameters, the alpha values, both overlaps, the interval half-widths and the trials.
+    """
+    if points < 2:
+        raise ValueError(f"points must be at least 2, got {points}")
+    alpha_values = [a/(points-1) for a in range(points)]
+
+    sweep = AdaptiveSweep(lambda alphas, seeds: [result[0] for result in run_batch(n, k, alphas, seeds)],
+                          alpha_values,
+                          initial_trials=2,
+                          target_half_width=target_half_width,
+                          max_trials=max_trials_per_point*len(alpha_values),
+                          batch_size=batch_size)
+    means, half_widths = sweep.run()
+    logging.info(f"{sweep.total_trials} trials")
+
+    return {"n": n, "k": k,
+            "alpha": alpha_values,
+            "expected_overlap": [compute_expression(n, k, alpha) for alpha in alpha_values],
+            "empirical_overlap": means[:, 0].tolist(),
+            "half_width": half_widths[:, 0].tolist(),
+            "trials": sweep.trials.tolist()}
+
+
+def make_plot(**parameters):
+    """
+    Generates and plots the theoretical bound and empirical overlap against varying alpha values,
+    passing the parameters on to run_experiment.
+    """
+    import matplotlib.pyplot as plt
+
+    result = run_experiment(**parameters)
+    alpha_values = result["alpha"]
+    expected_overlap = result["expected_overlap"]
+    actual_overlap = result["empirical_overlap"]
+
+    # Create a figure and a set of subplots
+
+    fig, ax = plt.subplots()
+
+    # Plotting the first graph on the subplot
+    ax.plot(alpha_values, expected_overlap, label='Expected Overlap')
+
+    # Plotting the second graph on the same subplot
+    ax.plot(alpha_values, actual_overlap, label='Empirical Overlap')
+
+    # Setting title and labels
+    ax.set_title('The expected and empirical overlap of the caps two stimuli\nthat overlap in a fraction alpha of their nodes')
+    ax.set_xlabel('Alpha')
+    ax.set_ylabel('Overlap of k_cap in downstream area')
+
+    # Adding a legend to differentiate the two lines
+    ax.legend()
+
+    # Show the plot
+    plt.show()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    make_plot()
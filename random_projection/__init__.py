@@ -0,0 +1,6 @@
+"""
+A computational study of random projection in the brain.
+
+The modules are not imported here, so that importing the package, the brain model or the command line
+interface stays fast; import them directly, e.g. random_projection.brain.
+"""
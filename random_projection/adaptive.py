@@ -0,0 +1,129 @@
+import math
+
+import numpy as np
+
+
+class AdaptiveSweep:
+    def __init__(self, trial, points, initial_trials=2, trials_per_round=None, target_half_width=0.02,
+                 max_trials=None, confidence=0.95, curvature_weight=1.0, batch_size=None):
+        """
+        Initialize an AdaptiveSweep, which estimates the mean of a random trial at every point of a curve.
+
+        Instead of running a fixed number of trials per point, the trials are run in rounds. Every round
+        gives its trials to the points whose confidence interval is widest or where the curve bends most,
+        until every confidence interval is narrower than the target or the budget is spent.
+
+        :param trial: Function trial(point, seed) returning a number or a sequence of numbers.
+        :param points: The points of the curve, for example the alpha values.
+        :param initial_trials: Number of trials every point gets in the first round, at least 2.
+        :param trials_per_round: Number of trials per later round. Defaults to the number of points.
+        :param target_half_width: Half-width of the confidence interval at which a point is precise enough.
+        :param max_trials: Total number of trials that may be run, at least initial_trials per point.
+                           Defaults to 20 trials per point.
+        :param confidence: Confidence level of the intervals.
+        :param curvature_weight: Weight of the curvature of the curve against the interval half-width.
+        :param batch_size: If given, trial is called as trial(points, seeds) with up to this many trials of
+                           a round at once, and returns one result per trial.
+        """
+        self.trial = trial
+        self.points = list(points)
+        self.initial_trials = max(2, initial_trials)
+        self.trials_per_round = trials_per_round or len(self.points)
+        self.target_half_width = target_half_width
+        self.max_trials = 20 * len(self.points) if max_trials is None else max_trials
+        if self.max_trials < self.initial_trials * len(self.points):
+            raise ValueError(f"max_trials={self.max_trials} does not cover the {self.initial_trials} initial "
+                             f"trials at each of the {len(self.points)} points")
+        self.z = _normal_quantile(0.5 + confidence / 2)
+        self.curvature_weight = curvature_weight
+        self.batch_size = batch_size
+        self.results = [[] for _ in self.points]
+
+    @property
+    def total_trials(self):
+        """Number of trials run so far."""
+        return sum(len(results) for results in self.results)
+
+    @property
+    def trials(self):
+        """Number of trials run at every point."""
+        return np.array([len(results) for results in self.results])
+
+    def run(self):
+        """
+        Run rounds of trials until the target precision is met or the budget is spent.
+
+        :return: (means, half_widths): arrays with one row per point and one column per value of the trial.
+        """
+        self._run_trials([index for index in range(len(self.points)) for _ in range(self.initial_trials)])
+
+        while self.total_trials < self.max_trials:
+            means, half_widths = self.estimate()
+            widest = half_widths.max(axis=1)
+            if widest.max() <= self.target_half_width:
+                break
+
+            score = widest + self.curvature_weight * self._curvature(means)
+            score[widest <= self.target_half_width] = 0
+            budget = min(self.trials_per_round, self.max_trials - self.total_trials)
+            self._run_trials([index for index in np.argsort(-score, kind='stable')[:budget] if score[index] > 0])
+
+        return self.estimate()
+
+    def estimate(self):
+        """
+        Estimate the mean and the confidence interval half-width at every point.
+
+        The variance at a point is shrunk towards the median variance over all points, so a point whose
+        first trials happen to agree is not mistaken for a precise one.
+
+        :return: (means, half_widths): arrays with one row per point and one column per value of the trial.
+        """
+        samples = [np.array(results, dtype=float).reshape(len(results), -1) for results in self.results]
+        means = np.array([sample.mean(axis=0) for sample in samples])
+        variances = np.array([sample.var(axis=0, ddof=1) for sample in samples])
+        counts = self.trials[:, None]
+
+        typical = np.median(variances, axis=0)
+        shrunk = (counts * variances + self.initial_trials * typical) / (counts + self.initial_trials)
+        half_widths = self.z * np.sqrt(shrunk / counts)
+        return means, half_widths
+
+    def _run_trials(self, indices):
+        """
+        Run the next trial at the points with the given indices, each seeded with the number of trials
+        run at its point before it.
+        """
+        if self.batch_size is None:
+            for index in indices:
+                seed = len(self.results[index])
+                self.results[index].append(self.trial(self.points[index], seed))
+            return
+
+        for start in range(0, len(indices), self.batch_size):
+            batch = indices[start:start + self.batch_size]
+            seeds = []
+            for position, index in enumerate(batch):
+                seeds.append(len(self.results[index]) + batch[:position].count(index))
+            results = self.trial([self.points[index] for index in batch], seeds)
+            for index, result in zip(batch, results):
+                self.results[index].append(result)
+
+    def _curvature(self, means):
+        """Absolute second difference of the estimated curve at every point, the largest over all values of the trial."""
+        curvature = np.zeros(len(self.points))
+        if len(self.points) >= 3:
+            curvature[1:-1] = np.abs(means[:-2] - 2 * means[1:-1] + means[2:]).max(axis=1)
+        return curvature
+
+
+def _normal_quantile(p):
+    """Quantile function of the standard normal distribution, by bisection on math.erf."""
+    low, high = -10.0, 10.0
+    for _ in range(100):
+        middle = (low + high) / 2
+        if 0.5 * (1 + math.erf(middle / math.sqrt(2))) < p:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
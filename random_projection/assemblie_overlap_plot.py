@@ -0,0 +1,177 @@
+import random
+import math
+import logging
+import numpy as np
+from .adaptive import AdaptiveSweep
+from .ensemble import BrainEnsemble
+
+# Constants
+# feel free to change n and k
+n = 2000 # The number of neurons per brain area, possibly related to the size of the modeled brain area
+k = 100 # Possibly related to the assemblie size or group of neurons in the model
+
+def make_stimuli(overlap_stimulus, Seed, n=n, k=k):
+    """
+    Draws two stimuli of k neurons that share a fraction overlap_stimulus of their neurons.
+
+    :param overlap_stimulus: Fraction of overlapping neurons between the two stimuli.
+    :param Seed: Seed value for random number generation to ensure reproducibility.
+    :param n: The number of neurons per brain area.
+    :param k: The assemblie size.
+    :return: The neuron_IDs of both stimuli.
+    """
+    generator = random.Random(Seed)
+    Stimulus1 = generator.sample(range(n), k)
+    shared = generator.sample(Stimulus1, math.floor(k*overlap_stimulus))
+    outside = sorted(set(range(n)) - set(Stimulus1))
+    Stimulus2 = shared + generator.sample(outside, k - len(shared))
+    return Stimulus1, Stimulus2
+
+
+def form_assemblies(Ensemble, Stimulus):
+    """
+    Fires the stimulus into area 0 of every member together with the assemblies of both areas until an
+    iteration brings no new winner. Members whose assemblies are completed stop, while the others go on
+    in the same calls.
+
+    :param Ensemble: The BrainEnsemble.
+    :param Stimulus: neuron_IDs of the stimulus of every member, of shape (members, k).
+    :return: The last k-cap of area 0 of every member.
+    """
+    Area1, Area2 = Ensemble.brain_areas
+    winners1 = np.zeros(Area1.firing.shape, dtype=bool)
+    winners2 = np.zeros(Area2.firing.shape, dtype=bool)
+    p = np.zeros((Ensemble.size, Ensemble.assemblie_size), dtype=np.int64)
+    while Ensemble.active.any():
+        active = Ensemble.active.copy()
+        before = winners1.sum(axis=1) + winners2.sum(axis=1)
+        Area1.assemblie_fire_custom(Stimulus)
+        p1 = Area1.assemblie_fire()
+        q1 = Area2.assemblie_fire()
+
+        rows = np.flatnonzero(active)[:, None]
+        winners1[rows, p1[active]] = True
+        winners2[rows, q1[active]] = True
+        p[active] = p1[active]
+        Ensemble.active &= winners1.sum(axis=1) + winners2.sum(axis=1) > before
+    return p
+
+
+def run_batch(overlaps_stimulus, Seeds, n=n, k=k):
+    """
+    Runs the model once for every pair of stimulus overlap and seed, all in one BrainEnsemble.
+
+    Every trial projects its stimuli from area 0 into area 1 of the Brain with its seed.
+
+    :param overlaps_stimulus: Fraction of overlapping neurons between the two stimuli of every trial.
+    :param Seeds: Seed of every trial.
+    :param n: The number of neurons per brain area.
+    :param k: The assemblie size.
+    :return: A list with [projection_overlap, assemblie_overlap] for every trial.
+    """
+    Ensemble = BrainEnsemble(Seeds,
+                             num_brain_areas=2,
+                             neurons_per_area=n,
+                             vertice_probability=0.003,
+                             assemblie_size=k,
+                             area_vertice_probability=1,
+                             plasticity=0.1)
+    Area1, Area2 = Ensemble.brain_areas
+    stimuli = [make_stimuli(overlap_stimulus, Seed, n, k) for overlap_stimulus, Seed in zip(overlaps_stimulus, Seeds)]
+    Stimulus1 = np.array([stimulus1 for stimulus1, _ in stimuli])
+    Stimulus2 = np.array([stimulus2 for _, stimulus2 in stimuli])
+
+    #make the projections of both stimuli
+    Area1.assemblie_fire_custom(Stimulus1)
+    k_caps1 = Area2.make_k_cap(k)
+    Ensemble.reset()
+
+    Area1.assemblie_fire_custom(Stimulus2)
+    k_caps2 = Area2.make_k_cap(k)
+    Ensemble.reset()
+
+    #create the assemblies of both stimuli
+    p1 = form_assemblies(Ensemble, Stimulus1)
+    Ensemble.reset()
+    p2 = form_assemblies(Ensemble, Stimulus2)
+    Ensemble.reset()
+
+    #compute the overlaps of the projections and of the assemblies
+    in_caps1 = np.zeros((len(Seeds), n), dtype=bool)
+    np.put_along_axis(in_caps1, k_caps1, True, axis=1)
+    projection_overlap = np.take_along_axis(in_caps1, k_caps2, axis=1).sum(axis=1)/k
+    in_p1 = np.zeros((len(Seeds), n), dtype=bool)
+    np.put_along_axis(in_p1, p1, True, axis=1)
+    assemblie_overlap = np.take_along_axis(in_p1, p2, axis=1).sum(axis=1)/k
+    return [list(overlaps) for overlaps in zip(projection_overlap, assemblie_overlap)]
+
+
+# Theoretical and Conjectured Bound Functions
+# These functions  relate to the theoretical and conjectured bounds discussed in the paper, providing a way to compare the model outputs with the expected bounds
+def theoretical_bound(x, n=n, k=k):
+    temp = (1-x)/(1+x)
+    temp = (k/n)**temp
+    temp2 = x/(1+x)
+    temp2 = math.log(n/k)**temp2
+    return temp/temp2
+
+def conjectured_bound(x, n=n, k=k):
+    temp = (1-x)/(1+x)
+    temp = (k/n)**temp
+    return temp
+
+
+def run_experiment(n=n, k=k, target_half_width=0.02, max_trials_per_point=20, batch_size=64):
+    """
+    Computes the projection overlap and the assemblie overlap for stimulus overlaps from 0.1 to 0.69.
+
+    Trials are run in rounds and go to the stimulus overlap values where the confidence interval is
+    widest or the curves bend most, instead of a fixed number of iterations per value.
+
+    :param n: The number of neurons per brain area.
+    :param k: The assemblie size.
+    :param target_half_width: Half-width of the confidence interval at which a value is precise enough.
+    :param max_trials_per_point: Trial budget, as the average number of trials per stimulus overlap value.
+    :param batch_size: Number of trials run together in one BrainEnsemble.
+    :return: dict with the parameters, the stimulus overlaps, both empirical overlaps, both bounds and the trials.
+    """
+    # Lists to store overlap values for different simulations
+    x=[ii * 0.01 for ii in range(10,70)] # To store stimulus overlap values
+
+    Sweep = AdaptiveSweep(lambda overlaps_stimulus, Seeds: run_batch(overlaps_stimulus, Seeds, n, k),
+                          x, initial_trials=3, target_half_width=target_half_width,
+                          max_trials=max_trials_per_point*len(x), batch_size=batch_size)
+    means, half_widths = Sweep.run()
+    logging.info(f"{Sweep.total_trials} trials")
+
+    return {"n": n, "k": k,
+            "stimulus_overlap": x,
+            "projection_overlap": means[:, 0].tolist(), # projection overlap values
+            "assemblie_overlap": means[:, 1].tolist(), # assemblie overlap values
+            "conjectured_bound": [conjectured_bound(i, n, k) for i in x],
+            "theoretical_bound": [theoretical_bound(i, n, k) for i in x],
+            "trials": Sweep.trials.tolist()}
+
+
+def make_plot(**parameters):
+    """Plots the overlaps and the bounds, passing the parameters on to run_experiment."""
+    import matplotlib.pyplot as plt
+
+    result = run_experiment(**parameters)
+    x = result["stimulus_overlap"]
+
+    plt.xlabel('Stimulus Overlap')
+    plt.ylabel('Projection Overlap')
+
+    # Plot the function
+    plt.plot(x, result["assemblie_overlap"], '-', label='assemblie overlap')
+    plt.plot(x, result["projection_overlap"],'-', label='projection overlap')
+    plt.plot(x, result["conjectured_bound"], '-', label='conjectured bound')
+    plt.plot(x, result["theoretical_bound"], '-', label='theoretical bound')
+    plt.legend()
+    plt.show()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    make_plot()
@@ -0,0 +1,59 @@
+import time
+import argparse
+
+import numpy as np
+
+from . import kernels
+from .connectome import Connectome
+
+
+def run(connectome, stimulus, plasticity, assemblie_size, iterations, use_jit):
+    """
+    Fire the stimulus once and then the k-cap repeatedly, like repeated BrainArea.assemblie_fire calls.
+
+    :return: (seconds, caps, weights): the time of the repeated steps, the caps and the final weights.
+    """
+    connectome.reset()
+    n = connectome.n_source
+    firing = np.zeros(n, dtype=bool)
+    firing[stimulus] = True
+    firing_prev = np.zeros(n, dtype=bool)
+    incoming_fire = connectome.propagate(firing)
+
+    caps = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        caps.append(kernels.assemblie_fire(connectome, incoming_fire, firing, firing_prev, plasticity,
+                                           assemblie_size, use_jit=use_jit))
+    return time.perf_counter() - start, np.array(caps), connectome.weights.copy()
+
+
+def main():
+    """Compare the numpy steps with the fused compiled kernel and check that both give identical results."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--n", type=int, default=10000)
+    parser.add_argument("--k", type=int, default=100)
+    parser.add_argument("--p", type=float, default=0.01)
+    parser.add_argument("--plasticity", type=float, default=0.1)
+    parser.add_argument("--iterations", type=int, default=100)
+    arguments = parser.parse_args()
+
+    connectome = Connectome.random(arguments.n, arguments.n, arguments.p, seed=1, allow_self_connections=False)
+    stimulus = np.random.default_rng(1).choice(arguments.n, size=arguments.k, replace=False)
+    parameters = (connectome, stimulus, arguments.plasticity, arguments.k, arguments.iterations)
+
+    numpy_seconds, numpy_caps, numpy_weights = run(*parameters, use_jit=False)
+    print(f"numpy: {numpy_seconds:.3f} s for {arguments.iterations} steps")
+    if not kernels.JIT_AVAILABLE:
+        print("numba is not installed, the fused kernel is not available")
+        return
+
+    run(*parameters, use_jit=True)  # compile
+    jit_seconds, jit_caps, jit_weights = run(*parameters, use_jit=True)
+    print(f"fused: {jit_seconds:.3f} s for {arguments.iterations} steps, {numpy_seconds / jit_seconds:.1f}x faster")
+    print(f"identical caps: {np.array_equal(numpy_caps, jit_caps)}, "
+          f"identical weights: {np.array_equal(numpy_weights, jit_weights)}")
+
+
+if __name__ == "__main__":
+    main()
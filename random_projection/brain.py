@@ -0,0 +1,731 @@
+import os
+import re
+import random
+import logging
+import time
+import itertools
+import tempfile
+
+# numpy and the connectome module are imported where they are first needed,
+# so that importing this module stays fast
+
+
+class Brain:
+    def __init__(self, seed, num_brain_areas, neurons_per_area, vertice_probability, plasticity, assemblie_size,area_vertice_probability,
+                 memory_budget=None, cache_directory=None, storage_directory=None, plasticity_rules=None, workers=1,
+                 shards=None):
+        """
+        Initialize the Brain model with given parameters.
+
+        The connections within an area and between two neighbouring areas form one block, which is
+        only built when a projection first crosses it. Every block is generated from its own seed,
+        so an evicted block can be regenerated; only its weights are kept in the connectome cache
+        if they have changed. Nothing is drawn from the global random state, so the connections only
+        depend on the seed, and neither on the number of workers nor on the order the blocks are built in.
+
+        :param seed: Seed for random number generator.
+        :param num_brain_areas: Number of brain areas in the model.
+        :param neurons_per_area: Number of neurons in each brain area.
+        :param vertice_probability: Probability of creating connections between neurons and brain areas.
+        :param plasticity: The plasticity factor affecting the connection weights.
+        :param assemblie_size: Size of the neuron assemblies.
+        :param area_vertice_probability: Probability that two areas are neighbouring and therefore connected
+        :param memory_budget: Maximum number of bytes used by the blocks in memory, or None for no limit.
+        :param cache_directory: Directory the weights of evicted blocks are saved to. If None, they are kept in
+                                memory, or in a temporary directory when there is a memory budget.
+        :param storage_directory: Directory the blocks are kept in as memory-mapped files, for brains whose
+                                  connections do not fit into memory, or None to keep them in memory. The
+                                  blocks in it must have been generated by a Brain with the same parameters.
+        :param plasticity_rules: PlasticityRules applied after every step to the connections leaving the
+                                 previous winners, by default multiplicative Hebbian potentiation.
+        :param workers: Number of worker processes that generate the rows of a block.
+        :param shards: Number of worker processes the connections within every brain area are partitioned
+                       across as a ShardedConnectome, each of which draws and propagates its own rows, or
+                       None to keep them in this process. Cannot be combined with a storage directory.
+
+        """
+        from .connectome import ConnectomeCache
+        from .plasticity import Hebbian
+
+        if shards is not None and storage_directory is not None:
+            raise ValueError("The connections within an area are either sharded or memory-mapped, not both")
+
+        self.seed = seed
+        self.num_brain_areas = num_brain_areas
+        self.neurons_per_area = neurons_per_area
+        self.vertice_probability = vertice_probability
+        self.plasticity = plasticity
+        self.assemblie_size = assemblie_size
+        self.brain_areas = set()
+        self.area_vertice_probability=area_vertice_probability
+        self.memory_budget = memory_budget
+        self._temporary_cache = None
+        if memory_budget is not None and cache_directory is None:
+            # Weights kept in memory would not be bounded by the budget
+            self._temporary_cache = tempfile.TemporaryDirectory(prefix="brain_cache_")
+            cache_directory = self._temporary_cache.name
+        self.cache = ConnectomeCache(cache_directory)
+        self.storage_directory = storage_directory
+        if storage_directory is not None:
+            os.makedirs(storage_directory, exist_ok=True)
+        self.plasticity_rules = [Hebbian(plasticity)] if plasticity_rules is None else plasticity_rules
+        self.workers = workers
+        self.shards = shards
+        self.blocks = {}
+        self._last_used = {}
+        self._clock = itertools.count()
+
+        self._create_brain_areas()
+        self._create_area_connections()
+
+    def _create_brain_areas(self):
+        """Create brain areas based on the specified number of brain areas."""
+        for i in range(self.num_brain_areas):
+            self.brain_areas.add(
+                BrainArea(i, self.vertice_probability, self.plasticity, self.neurons_per_area, self.assemblie_size, self))
+        logging.info("Brain areas created.")
+
+    def _create_area_connections(self):
+        """Create connections between neighbouring brain areas."""
+        generator = random.Random(self.seed)
+        for area_a in sorted(self.brain_areas, key=lambda area: area.ID):
+            for area_b in sorted(self.brain_areas, key=lambda area: area.ID):
+                if area_a != area_b and generator.random() < self.area_vertice_probability:
+                    area_a.neighbouring_areas.add(area_b)
+        logging.info("Connections between brain areas created.")
+
+    def block(self, source_area, target_area):
+        """
+        Return the connections from one brain area to another, building them if they are not in memory.
+
+        :param source_area: The brain area the connections start from.
+        :param target_area: The same brain area or a neighbouring one.
+        :return: Connectome of the block.
+        """
+        key = (source_area.ID, target_area.ID)
+        block = self.blocks.get(key)
+        if block is None:
+            block = self._materialise(key)
+        self._last_used[key] = next(self._clock)
+        return block
+
+    def _materialise(self, key):
+        """Build the block with the given key from its seed and restore its cached weights."""
+        from .connectome import Connectome
+
+        source_ID, target_ID = key
+        if self.storage_directory is not None:
+            block = self._open_stored(key)
+        elif self._sharded(key):
+            from .sharded import ShardedConnectome
+
+            block = ShardedConnectome(self.neurons_per_area, self.neurons_per_area, self.vertice_probability,
+                                      seed=[self.seed, source_ID, target_ID], allow_self_connections=False,
+                                      workers=self.shards)
+            self._restore_weights(key, block)
+        else:
+            block = Connectome.random(self.neurons_per_area, self.neurons_per_area, self.vertice_probability,
+                                      seed=[self.seed, source_ID, target_ID],
+                                      allow_self_connections=source_ID != target_ID, workers=self.workers)
+            self._restore_weights(key, block)
+        self.blocks[key] = block
+        logging.info(f"Connections from brain area {source_ID} to brain area {target_ID} created.")
+
+        self._evict_over_budget(key)
+        return block
+
+    def _restore_weights(self, key, block):
+        """Give a newly built block the weights kept in the connectome cache, if it has any."""
+        weights = self.cache.load(key)
+        if weights is not None:
+            block.weights[:] = weights
+
+    def build(self, workers=None):
+        """
+        Build all blocks that are not in memory yet, instead of building each one when a projection first crosses it.
+
+        The rows of all blocks are shared out among the worker processes together, so small blocks also
+        keep all workers busy. Memory-mapped blocks are generated one after another, each with all workers,
+        and sharded blocks by their own workers.
+
+        :param workers: Number of worker processes, by default the workers of the Brain.
+        """
+        from .connectome import Connectome
+        from .construction import random_connectomes
+
+        workers = self.workers if workers is None else workers
+        keys = [(area.ID, area.ID) for area in self.brain_areas]
+        keys += [(area.ID, neighbour.ID) for area in self.brain_areas for neighbour in area.neighbouring_areas]
+        keys = [key for key in sorted(keys) if key not in self.blocks]
+        if self.storage_directory is not None or self.shards is not None:
+            for key in keys:
+                self._materialise(key)
+            return
+
+        n = self.neurons_per_area
+        specs = [(n, n, self.vertice_probability, [self.seed, source_ID, target_ID], source_ID != target_ID)
+                 for source_ID, target_ID in keys]
+        for key, block in zip(keys, random_connectomes(specs, workers, cls=Connectome)):
+            self._restore_weights(key, block)
+            self.blocks[key] = block
+            self._last_used[key] = next(self._clock)
+            logging.info(f"Connections from brain area {key[0]} to brain area {key[1]} created.")
+        if keys:
+            self._evict_over_budget(keys[-1])
+
+    def _open_stored(self, key):
+        """
+        Open the memory-mapped block with the given key, generating its files from its seed the first time.
+        Files of a block generated with other parameters are rejected with a ValueError.
+        """
+        from .storage import MappedConnectome
+
+        source_ID, target_ID = key
+        directory = os.path.join(self.storage_directory, f"block_{source_ID}_{target_ID}")
+        parameters = (self.neurons_per_area, self.neurons_per_area, self.vertice_probability,
+                      [self.seed, source_ID, target_ID], source_ID != target_ID)
+        if not os.path.exists(os.path.join(directory, "meta.json")):
+            return MappedConnectome.random(directory, *parameters, workers=self.workers)
+        block = MappedConnectome(directory)
+        if not block.matches(*parameters):
+            raise ValueError(f"{directory} holds a block generated with other parameters than those of this brain")
+        return block
+
+    def _evict_over_budget(self, keep):
+        """Evict the least recently used blocks, except the one with key keep, until the memory budget is met."""
+        if self.memory_budget is None:
+            return
+        candidates = sorted((key for key in self.blocks if key != keep), key=lambda key: self._last_used.get(key, -1))
+        for key in candidates:
+            if self.memory_usage() <= self.memory_budget:
+                break
+            self.evict(key)
+
+    def evict(self, key):
+        """
+        Remove a block from memory. Its weights are kept in the connectome cache if they differ from
+        the initial weights; otherwise the block is simply regenerated from its seed when needed again.
+        Memory-mapped blocks write their dirty weights back to their files instead.
+
+        :param key: (source area ID, target area ID) of the block.
+        """
+        import numpy as np
+
+        block = self.blocks.pop(key)
+        self._last_used.pop(key, None)
+        if self.storage_directory is not None:
+            block.checkpoint()
+        elif not np.array_equal(block.weights, block.initial_weights):
+            # Sharded weights are in shared memory, which is released together with their workers
+            self.cache.store(key, block.weights.copy() if self._sharded(key) else block.weights)
+        if self._sharded(key):
+            block.close()
+        logging.info(f"Connections from brain area {key[0]} to brain area {key[1]} evicted.")
+
+    def _sharded(self, key):
+        """Whether the block with the given key is a ShardedConnectome: the connections within an area when there are shards."""
+        return self.shards is not None and key[0] == key[1]
+
+    def checkpoint(self):
+        """Write the changed weights of all memory-mapped blocks back to their files."""
+        if self.storage_directory is None:
+            return
+        for block in self.blocks.values():
+            block.checkpoint()
+
+    def block_memory(self):
+        """Return the number of bytes used by every block in memory."""
+        return {key: block.nbytes for key, block in self.blocks.items()}
+
+    def memory_usage(self):
+        """Return the number of bytes used by all blocks in memory and by the cached weights kept in memory."""
+        return sum(block.nbytes for block in self.blocks.values()) + self.cache.nbytes
+
+    def attach_recorder(self, recorder):
+        """
+        Record the neurons fired in every step of every brain area.
+
+        :param recorder: FiringRecorder the firing of all brain areas is logged to.
+        """
+        for area in self.brain_areas:
+            area.recorder = recorder
+
+    def reset(self):
+
+        # Reset the firing states and incoming fire count of all neurons in every brain area
+
+        for area in self.brain_areas: # Iterate over all brain areas
+            area.fired_neurons[:] = False
+            area.firing[:] = False  # Reset the firing state of the neurons
+            area.firing_prev[:] = False  # Reset the previous firing state of the neurons
+            area.incoming_fire[:] = 0  # Reset the incoming fire count of the neurons
+
+        # Reset the weights of all connections to their initial weights
+
+        for block in self.blocks.values():
+            block.reset()
+        self.cache.clear()  # Evicted blocks are regenerated with their initial weights
+        if self.storage_directory is not None:
+            self._reset_stored()
+
+    def _reset_stored(self):
+        """Reset the weights of the memory-mapped blocks that are not in memory."""
+        from .storage import MappedConnectome
+
+        for name in os.listdir(self.storage_directory):
+            match = re.fullmatch(r"block_(\d+)_(\d+)", name)
+            directory = os.path.join(self.storage_directory, name)
+            if match is None or not os.path.exists(os.path.join(directory, "meta.json")):
+                continue  # Not a block, or one whose files were never completed
+            if (int(match.group(1)), int(match.group(2))) not in self.blocks:
+                MappedConnectome(directory).reset()
+
+    def fire_brain_repeatedly(self, iterations):
+        """
+        Fires the whole brain repeatedly every second and logs the statistics.
+
+        :param iterations: Number of times to fire the whole brain.
+        """
+        for _ in range(iterations):
+            self.fire_whole_brain()
+            self.log_brain_stats()
+            time.sleep(1)  # Pause for one second between iterations
+
+    def fire_whole_brain(self):
+        """Simulate the firing of neurons in the whole brain."""
+        from .connectome import k_cap
+
+        all_k_caps = [(area, k_cap(area.incoming_fire, self.assemblie_size)) for area in self.brain_areas]
+
+        # Update the firing and firing_prev flags for each neuron in each area
+        for area in self.brain_areas:
+            area.reset_neurons_firing_state()
+
+        # Fire all neurons in k_caps and update the connections' weights
+        for area, indices in all_k_caps:
+            area.fire_indices(indices)
+            area.record_firing(indices)
+
+        for area in self.brain_areas:
+            area.update_connections_weight()
+
+        # Fade the connections that have not been succsessful in firing neurons
+        self.fade_connections()
+
+        logging.info("Whole brain fired.")
+
+    def project_chain(self, stimuli, path, recurrent_steps=0):
+        """
+        Project a batch of stimuli along a path of brain areas, A -> B -> C ..., and return every cap.
+
+        The fire of the cap of each area is propagated into the next area for all stimuli of the batch
+        in one sparse product, and the caps of the next area are selected with one k_cap call. With
+        recurrence, every area after the first fires its cap into itself recurrent_steps more times,
+        together with the constant fire of the cap of the previous area.
+
+        The projection only reads the connections: neither the firing state of the areas nor the
+        weights are changed, and no Neuron objects are created.
+
+        :param stimuli: neuron_IDs of the neurons fired in the first area, of shape (batch, stimulus size).
+        :param path: IDs of the brain areas; every area must be a neighbour of the one before it.
+        :param recurrent_steps: Number of times every area after the first refires its own cap.
+        :return: List with one array per area of the path: the stimuli for the first area, and the caps
+                 of shape (batch, recurrent_steps + 1, assemblie_size) for every following area, ordered
+                 by decreasing incoming fire.
+        """
+        import numpy as np
+        from .connectome import k_cap
+
+        areas = {area.ID: area for area in self.brain_areas}
+        stimuli = np.atleast_2d(np.asarray(stimuli, dtype=np.int64))
+        batch = stimuli.shape[0]
+        for source_ID, target_ID in zip(path, path[1:]):
+            if areas[target_ID] not in areas[source_ID].neighbouring_areas:
+                raise ValueError(f"Brain area {target_ID} is not a neighbour of brain area {source_ID}")
+
+        def active(caps):
+            fired = np.zeros((batch, self.neurons_per_area), dtype=bool)
+            np.put_along_axis(fired, caps, True, axis=1)
+            return fired
+
+        caps = [stimuli]
+        fired = active(stimuli)
+        for source_ID, target_ID in zip(path, path[1:]):
+            area = areas[target_ID]
+            feedforward = self.block(areas[source_ID], area).propagate(fired)
+            steps = [k_cap(feedforward, self.assemblie_size)]
+            for _ in range(recurrent_steps):
+                recurrent = self.block(area, area).propagate(active(steps[-1]))
+                steps.append(k_cap(feedforward + recurrent, self.assemblie_size))
+            caps.append(np.stack(steps, axis=1))
+            fired = active(steps[-1])
+        return caps
+
+    def log_brain_stats(self):
+        """Logs the statistics of the brain, including the percentage of fired neurons in each area."""
+        for area in self.brain_areas:
+            total_neurons = area.neurons_per_area
+            fired_neurons = int(area.fired_neurons.sum())
+            fired_percentage = (fired_neurons / total_neurons) * 100
+            logging.info(
+                f"Brain Area {area.ID}: {fired_percentage:.2f}% neurons fired. Total Neurons: {total_neurons}, Fired Neurons: {fired_neurons}")
+
+    def fade_connections(self):
+        """fades the connections that have been activated but did not lead
+        to the succsessful firing of the connected neuron"""
+        from .plasticity import Fading
+
+        fading = [Fading(self.plasticity)]
+        for area in self.brain_areas:
+            area.update_connections_weight(fading)
+
+
+class BrainArea:
+    def __init__(self, ID, vertice_probability, plasticity, neurons_per_area, assemblie_size, brain):
+        """
+        Initialize a BrainArea with given parameters.
+
+        The state of all neurons is kept in arrays; Neuron objects are only created when a neuron
+        of the area is accessed, so a step only creates the Neuron objects of its k-cap.
+
+        :param ID: Identifier for the brain area.
+        :param vertice_probability: Probability of creating connections between neurons.
+        :param plasticity: The plasticity factor affecting the connection weights.
+        :param neurons_per_area: Number of neurons in the brain area.
+        :param assemblie_size: Size of the neuron assemblies.
+        :param brain: The Brain that owns the connections of the brain area.
+        """
+        import numpy as np
+
+        self.ID = ID
+        self.vertice_probability = vertice_probability
+        self.plasticity = plasticity
+        self.neurons_per_area = neurons_per_area
+        self.neighbouring_areas = set()
+        self.assemblie_size = assemblie_size
+        self.brain = brain
+        # Neuron objects created so far, by neuron_ID, and the list of all of them once it is accessed
+        self._neurons = {}
+        self._all_neurons = None
+
+        # Firing state and incoming fire of every neuron
+        self.firing = np.zeros(neurons_per_area, dtype=bool)
+        self.firing_prev = np.zeros(neurons_per_area, dtype=bool)
+        self.incoming_fire = np.zeros(neurons_per_area)
+
+        # Mask of the neurons that have fired
+        self.fired_neurons = np.zeros(neurons_per_area, dtype=bool)
+        # Optional FiringRecorder that logs the neurons fired in every step
+        self.recorder = None
+
+    @property
+    def neurons(self):
+        """The Neuron objects of the brain area, ordered by their neuron_ID."""
+        if self._all_neurons is None:
+            self._all_neurons = [self.neuron(i) for i in range(self.neurons_per_area)]
+        return self._all_neurons
+
+    def neuron(self, neuron_ID):
+        """The Neuron object of one neuron of the brain area, which is the same object every time."""
+        neuron = self._neurons.get(neuron_ID)
+        if neuron is None:
+            neuron = self._neurons[neuron_ID] = Neuron(self, int(neuron_ID))
+        return neuron
+
+    def target_areas(self):
+        """The brain areas the neurons of this area are connected to: the area itself and its neighbours."""
+        return [self] + sorted(self.neighbouring_areas, key=lambda area: area.ID)
+
+    def assemblie_fire(self):
+        """
+        This method simulates the firing of a neuron assembly within the brain area.
+
+        1. It first creates a k-cap assembly of neurons based on their incoming fire.
+        2. Then, it resets the firing state of all neurons in the brain area.
+        3. After that, it fires all neurons in the k-cap assembly.
+        4. Finally, it updates the weight of all connections in the brain area based on the firing state of connected neurons.
+
+        An area without neighbours and with plain Hebbian plasticity runs all four steps in one
+        compiled kernel if numba is installed.
+
+        :return: k_cap: list of Neuron objects representing the neurons in the k-cap assembly that have been fired.
+        """
+        return [self.neuron(i) for i in self._fire_k_cap()]
+
+    def _fire_k_cap(self):
+        """Run the steps of assemblie_fire and return the neuron_IDs of the k-cap assembly."""
+        from .connectome import k_cap
+
+        if self._can_fuse():
+            from . import kernels
+
+            block = self.brain.block(self, self)
+            indices = kernels.assemblie_fire(block, self.incoming_fire, self.firing, self.firing_prev,
+                                             self.plasticity, self.assemblie_size)
+            self.record_firing(indices)
+            return indices
+
+        # Create a k-cap assembly of neurons based on their incoming fire
+        indices = k_cap(self.incoming_fire, self.assemblie_size)
+
+        # Reset the firing state and incoming fire of all neurons in the brain area
+        self.reset_neurons_firing_state()
+
+        # Fire all neurons in the k-cap assembly
+        self.fire_indices(indices)
+        self.record_firing(indices)
+
+        # Update the weight of all connections in the brain area
+        self.update_connections_weight()
+
+        # Return the neuron_IDs of the k-cap assembly that has been fired
+        return indices
+
+    def assemblie_fire_repeatedly(self, iterations):
+        """
+        Fire the k-cap assembly of the brain area repeatedly, exactly like calling assemblie_fire
+        iterations times.
+
+        After the first step, the incoming fire of the area only changes by the connections of the neurons
+        that entered or left the cap and of the connections whose weights changed, so it is kept in an
+        IncrementalCap instead of being propagated and ranked from scratch in every step. Small areas,
+        areas that assemblie_fire runs as one compiled kernel, and blocks that are memory-mapped or may
+        be evicted simply fire repeatedly.
+
+        :param iterations: Number of steps.
+        :return: neuron_IDs of the k-cap of every step, of shape (iterations, assemblie_size).
+        """
+        import numpy as np
+        from .connectome import Connectome, k_cap
+        from .incremental import IncrementalCap, worthwhile
+        from .plasticity import apply_rules
+
+        block = self.brain.block(self, self)
+        if (iterations <= 1 or self._can_fuse() or type(block) is not Connectome
+                or self.brain.memory_budget is not None
+                or not worthwhile(self.neurons_per_area, self.assemblie_size)):
+            caps = [self._fire_k_cap() for _ in range(iterations)]
+            return np.array(caps, dtype=np.int64).reshape(iterations, -1)
+
+        caps = [self._fire_k_cap()]
+        cap = k_cap(self.incoming_fire, self.assemblie_size)
+        index = IncrementalCap(block, self.assemblie_size)
+        index.fire(self.firing)
+        for iteration in range(1, iterations):
+            caps.append(cap)
+            self.firing_prev[:] = self.firing
+            self.firing[:] = False
+            self.firing[cap] = True
+            index.fire(self.firing)
+            if iteration == iterations - 1:
+                self.incoming_fire[:] = block.propagate(self.firing)
+            else:
+                cap = index.cap()  # Selected before the weights of this step change, like in assemblie_fire
+            for target_area in self.target_areas()[1:]:
+                target_area.incoming_fire += self.brain.block(self, target_area).propagate(self.firing)
+            self.record_firing(caps[-1])
+
+            for target_area in self.target_areas():
+                step = apply_rules(self.brain.plasticity_rules, self.brain.block(self, target_area),
+                                   self.firing_prev, target_area.firing)
+                if target_area is self and step is not None:
+                    changed = step.weights != step.before
+                    index.weights_changed(step.edges[changed], step.before[changed])
+        return np.array(caps, dtype=np.int64)
+
+    def _can_fuse(self):
+        """Whether assemblie_fire can run as one compiled kernel: numba is installed, the area has no
+        neighbours, its connections are an in-memory block and the only plasticity rule is Hebbian."""
+        from . import kernels
+        from .connectome import Connectome
+        from .plasticity import Hebbian
+
+        if self.neighbouring_areas or not kernels.JIT_AVAILABLE:
+            return False
+        rules = self.brain.plasticity_rules
+        if len(rules) != 1 or type(rules[0]) is not Hebbian or rules[0].plasticity != self.plasticity:
+            return False
+        return type(self.brain.block(self, self)) is Connectome
+
+    def assemblie_fire_custom(self, list):
+        """
+        This method simulates the firing of an assembly of neurons and updates the state
+        and synaptic weights of the neurons in the assembly.
+
+        Parameters:
+        list (List[Neuron]): A list of Neuron objects representing the neurons in the assembly
+                             that are to be fired.
+
+        Returns:
+        List[Neuron]: Returns the list of Neuron objects that were fired.
+        """
+
+        # Reset the firing states of all neurons in the assembly
+        self.reset_neurons_firing_state()
+
+        # Fire the neurons in the provided list
+        indices = [neuron.neuron_ID for neuron in list]
+        self.fire_indices(indices)
+        self.record_firing(indices)
+
+        # Update the synaptic weights of the connections of all neurons in the assembly
+        self.update_connections_weight()
+
+        # Return the list of neurons that were fired
+        return list
+
+    def fire_indices(self, indices):
+        """
+        Set the given neurons to firing state and propagate their fire to the connected neurons
+        of this area and of the neighbouring areas.
+
+        :param indices: neuron_IDs of the neurons that fire.
+        """
+        import numpy as np
+
+        fired = np.zeros(self.neurons_per_area, dtype=bool)
+        fired[np.asarray(indices, dtype=np.int64)] = True
+        self.firing |= fired
+        for target_area in self.target_areas():
+            target_area.incoming_fire += self.brain.block(self, target_area).propagate(fired)
+
+    def make_k_cap(self, assemblie_size):
+        """Create a k-cap assembly of neurons based on their incoming fire."""
+        from .connectome import k_cap
+
+        return [self.neuron(i) for i in k_cap(self.incoming_fire, assemblie_size)]
+
+    def record_firing(self, indices):
+        """
+        Keep track of the neurons that have fired in this step.
+
+        :param indices: neuron_IDs of the neurons of the brain area that have fired.
+        """
+        import numpy as np
+
+        indices = np.asarray(indices, dtype=np.int64)
+        self.fired_neurons[indices] = True
+        if self.recorder is not None:
+            self.recorder.record(self.ID, self.neurons_per_area, indices)
+
+    def reset_neurons_firing_state(self):
+        """Reset the firing state of all neurons in the brain area."""
+        self.firing_prev[:] = self.firing  # Neurons that were firing are now the previously firing ones
+        self.firing[:] = False  # Reset the current firing state
+        self.incoming_fire[:] = 0  # Reset the incoming fire count
+
+    def update_connections_weight(self, rules=None):
+        """
+        Update the weight of the connections leaving the neurons of the brain area that fired in the previous step.
+
+        :param rules: PlasticityRules to apply, by default the plasticity rules of the brain.
+        """
+        from .plasticity import apply_rules
+
+        if not self.firing_prev.any():
+            return
+        for target_area in self.target_areas():
+            block = self.brain.block(self, target_area)
+            apply_rules(self.brain.plasticity_rules if rules is None else rules,
+                        block, self.firing_prev, target_area.firing)
+
+
+class Neuron:
+    def __init__(self, brain_area, neuron_ID):
+        """
+        Initialize a Neuron with given parameters.
+
+        A Neuron is a view on one entry of the state arrays of its brain area.
+
+        :param brain_area: The brain area to which the neuron belongs.
+        :param neuron_ID: Identifier for the neuron within the brain area.
+        """
+        self.brain_area = brain_area
+        self.brain_area_ID = brain_area.ID
+        self.neuron_ID = neuron_ID
+
+    @property
+    def firing(self):
+        return bool(self.brain_area.firing[self.neuron_ID])
+
+    @firing.setter
+    def firing(self, value):
+        self.brain_area.firing[self.neuron_ID] = value
+
+    @property
+    def firing_prev(self):
+        return bool(self.brain_area.firing_prev[self.neuron_ID])
+
+    @firing_prev.setter
+    def firing_prev(self, value):
+        self.brain_area.firing_prev[self.neuron_ID] = value
+
+    @property
+    def incoming_fire(self):
+        return float(self.brain_area.incoming_fire[self.neuron_ID])
+
+    @incoming_fire.setter
+    def incoming_fire(self, value):
+        self.brain_area.incoming_fire[self.neuron_ID] = value
+
+    @property
+    def connections(self):
+        """The outgoing connections of the neuron into its own and the neighbouring brain areas."""
+        import numpy as np
+
+        connections = []
+        for target_area in self.brain_area.target_areas():
+            block = self.brain_area.brain.block(self.brain_area, target_area)
+            edges, targets, _ = block.gather_edges(np.array([self.neuron_ID]))
+            for edge, target in zip(edges, targets):
+                connections.append(Connection(self, target_area.neuron(target), block, int(edge), self.brain_area.plasticity))
+        return connections
+
+    def fire(self):
+        """Set the neuron to firing state and propagate the fire to connected neurons."""
+        self.brain_area.fire_indices([self.neuron_ID])
+
+    def reset_firing_state(self):
+        """Reset the firing and previous firing state of the neuron."""
+        self.firing_prev = self.firing  # Set the previous firing state as True if the neuron was firing
+        self.firing = False  # Reset the current firing state
+        self.incoming_fire = 0  # Reset the incoming fire count
+
+
+class Connection:
+    def __init__(self, neuronA, neuronB, block, edge, plasticity):
+        """
+        Initialize a Connection with given parameters.
+
+        A Connection is a view on one entry of the block of connections between two brain areas.
+
+        :param neuronA: The starting neuron of the connection.
+        :param neuronB: The ending neuron of the connection.
+        :param block: The Connectome holding the connection.
+        :param edge: Index of the connection within the block.
+        :param plasticity: The plasticity factor affecting the connection weight.
+        """
+        self.neuronA = neuronA
+        self.neuronB = neuronB
+        self.block = block
+        self.edge = edge
+        self.plasticity = plasticity
+
+    @property
+    def weight(self):
+        return float(self.block.edge_weights([self.edge])[0])
+
+    @weight.setter
+    def weight(self, value):
+        import numpy as np
+
+        self.block.scatter_weights(np.array([self.edge]), np.array([value], dtype=float))
+
+    @property
+    def initial_weight(self):
+        return float(self.block.edge_weights([self.edge], initial=True)[0])
+
+    def update_weight(self):
+        """Update the weight of the connection based on the firing state of connected neurons."""
+        if self.neuronA.firing_prev and self.neuronB.firing:
+            self.weight *= (1 + self.plasticity)
@@ -0,0 +1,83 @@
+"""
+Command line entry point that runs any experiment headless and prints its result as JSON.
+
+The experiment modules, and with them numpy, matplotlib and pygame, are only imported once an
+experiment has been chosen, so that the help is shown without loading any of them.
+"""
+import argparse
+import importlib
+import json
+import logging
+import sys
+
+# experiment name: (module, help, [(parameter, type, nargs)])
+EXPERIMENTS = {
+    "theorem1": ("theorem1", "overlap of a random projection of two overlapping binary vectors",
+                 [("n", int, None), ("k", int, None), ("sparsity", float, None), ("trials", int, None)]),
+    "theorem3": ("Theorem3", "overlap of the k-caps of two overlapping stimuli in the downstream area",
+                 [("n", int, None), ("k", int, None), ("points", int, None), ("target_half_width", float, None),
+                  ("max_trials_per_point", int, None), ("batch_size", int, None)]),
+    "overlap": ("assemblie_overlap_plot", "projection and assemblie overlap of two overlapping stimuli",
+                [("n", int, None), ("k", int, None), ("target_half_width", float, None),
+                 ("max_trials_per_point", int, None), ("batch_size", int, None)]),
+    "plasticity": ("plasticity_plot", "total support of a repeatedly fired stimulus per plasticity parameter",
+                   [("n", int, None), ("k", int, None), ("seed", int, None), ("plasticities", float, "+"),
+                    ("vertice_probability", float, None), ("iterations", int, None)]),
+    "simulation": ("simulation", "interactive pygame visualisation of a brain",
+                   [("seed", int, None), ("num_brain_areas", int, None), ("neurons_per_area", int, None),
+                    ("vertice_probability", float, None), ("assemblie_size", int, None), ("plasticity", float, None),
+                    ("area_vertice_probability", float, None), ("step_interval", float, None)]),
+}
+
+
+def build_parser():
+    """Build the argument parser with one subcommand per experiment."""
+    parser = argparse.ArgumentParser(prog="random-projection", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--log-level", default="WARNING", help="logging level, e.g. INFO to follow the progress")
+    subparsers = parser.add_subparsers(dest="experiment", required=True)
+
+    for name, (module, help, parameters) in EXPERIMENTS.items():
+        subparser = subparsers.add_parser(name, help=help, description=help)
+        for parameter, type, nargs in parameters:
+            subparser.add_argument("--" + parameter.replace("_", "-"), dest=parameter, type=type, nargs=nargs,
+                                   help="defaults to the value of the experiment")
+        if name != "simulation":
+            subparser.add_argument("--plot", action="store_true", help="show the figure instead of printing JSON")
+            subparser.add_argument("--output", help="write the JSON result to this file instead of stdout")
+    return parser
+
+
+def main(argv=None):
+    """Run the experiment chosen on the command line."""
+    parser = build_parser()
+    arguments = parser.parse_args(argv)
+    logging.basicConfig(level=arguments.log_level.upper())
+
+    module_name, _, parameters = EXPERIMENTS[arguments.experiment]
+    values = {parameter: getattr(arguments, parameter) for parameter, _, _ in parameters
+              if getattr(arguments, parameter) is not None}
+
+    module = importlib.import_module("." + module_name, __package__)
+    if arguments.experiment == "simulation":
+        module.main(**values)
+        return 0
+    try:
+        if arguments.plot:
+            module.make_plot(**values)
+            return 0
+        result = module.run_experiment(**values)
+    except ValueError as error:
+        # Parameters the experiment rejects are reported like invalid arguments, with exit status 2
+        parser.error(f"{arguments.experiment}: {error}")
+
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(result, file)
+    else:
+        json.dump(result, sys.stdout)
+        sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
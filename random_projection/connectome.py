@@ -0,0 +1,348 @@
+import os
+
+import numpy as np
+
+# Number of rows of a random connectome drawn from one random stream
+ROWS_PER_BLOCK = 1024
+
+
+class Connectome:
+    def __init__(self, n_source, n_target, indptr, indices, initial_weights, weights=None):
+        """
+        Initialize a Connectome, the array form of all connections from one set of neurons to another.
+
+        The connections are stored in compressed sparse row (CSR) layout: the outgoing connections of
+        source neuron i are the entries indptr[i]:indptr[i + 1] of indices (the target neurons) and of
+        the weights.
+
+        :param n_source: Number of neurons the connections start from.
+        :param n_target: Number of neurons the connections end in.
+        :param indptr: Row pointers, array of length n_source + 1.
+        :param indices: Target neuron of every connection.
+        :param initial_weights: Initial weight of every connection.
+        :param weights: Current weights, either one weight per connection or one column per plasticity
+                        value. Defaults to a copy of the initial weights.
+        """
+        self.n_source = n_source
+        self.n_target = n_target
+        self.indptr = indptr
+        self.indices = indices
+        self.initial_weights = initial_weights
+        self.weights = initial_weights.copy() if weights is None else weights
+        # Sum of the incoming weights of every target neuron, kept up to date by the plasticity rules that need it
+        self.incoming_totals = None
+        self._initial_incoming_totals = None
+
+    @classmethod
+    def random(cls, n_source, n_target, vertice_probability, seed, allow_self_connections=True, workers=1,
+               rows_per_block=ROWS_PER_BLOCK):
+        """
+        Create a random connectome in which every pair of neurons is connected with the given probability.
+
+        Every block of rows is drawn from its own random stream, derived from the seed and the number of
+        the block, so the connectome only depends on the seed and the block size. With several workers the
+        blocks are generated in parallel processes, with a result identical to the one of a single worker.
+
+        :param n_source: Number of neurons the connections start from.
+        :param n_target: Number of neurons the connections end in.
+        :param vertice_probability: Probability of creating a connection between two neurons.
+        :param seed: Seed for random number generator.
+        :param allow_self_connections: False for connections within one area, where a neuron is never connected to itself.
+        :param workers: Number of worker processes the blocks of rows are generated in.
+        :param rows_per_block: Number of rows drawn from one random stream.
+        :return: Connectome with weights drawn uniformly from [1, 1.5) like the Brain model.
+        """
+        from .construction import random_connectomes
+
+        spec = (n_source, n_target, vertice_probability, seed, allow_self_connections)
+        return random_connectomes([spec], workers=workers, rows_per_block=rows_per_block, cls=cls)[0]
+
+    @classmethod
+    def stack(cls, connectomes):
+        """
+        Stack connectomes into one block-diagonal connectome, in which the neurons of the i-th connectome
+        follow those of the ones before it. The connections keep their order, so every part of the stack
+        propagates exactly like the connectome it was made from.
+
+        :param connectomes: Connectomes with the same numbers of source and target neurons and one weight per connection.
+        :return: Connectome over all source and all target neurons.
+        """
+        n_source, n_target = connectomes[0].n_source, connectomes[0].n_target
+        offsets = np.cumsum([0] + [connectome.num_connections for connectome in connectomes])
+        indptr = np.concatenate([[0]] + [connectome.indptr[1:] + offset
+                                         for connectome, offset in zip(connectomes, offsets)])
+        indices = np.concatenate([connectome.indices + np.int32(n_target * i) for i, connectome in enumerate(connectomes)])
+        initial_weights = np.concatenate([connectome.initial_weights for connectome in connectomes])
+        weights = np.concatenate([connectome.weights for connectome in connectomes])
+        return cls(n_source * len(connectomes), n_target * len(connectomes), indptr.astype(np.int64),
+                   indices.astype(np.int32), initial_weights, weights)
+
+    @property
+    def num_connections(self):
+        """Number of connections in the connectome."""
+        return self.indices.size
+
+    @property
+    def nbytes(self):
+        """Memory used by the topology and all weights in bytes."""
+        return self.indptr.nbytes + self.indices.nbytes + self.initial_weights.nbytes + self.weights.nbytes
+
+    def with_columns(self, columns):
+        """
+        Create a connectome that shares the topology and initial weights of this one but has one
+        weight column per plasticity value.
+
+        :param columns: Number of weight columns.
+        :return: Connectome with weights of shape (num_connections, columns).
+        """
+        weights = np.repeat(self.initial_weights[:, None], columns, axis=1)
+        return Connectome(self.n_source, self.n_target, self.indptr, self.indices, self.initial_weights, weights)
+
+    def reset(self):
+        """Reset the weights of all connections to their initial weights."""
+        self.incoming_totals = None
+        if self.weights.ndim == 1:
+            self.weights[:] = self.initial_weights
+        else:
+            self.weights[:] = self.initial_weights[:, None]
+
+    def row_edges(self, sources):
+        """
+        Collect the connections leaving the given source neurons.
+
+        :param sources: Sorted array of source neuron indices.
+        :return: (edges, origin): the connection indices and the source neuron of each of them.
+        """
+        starts = self.indptr[sources]
+        counts = self.indptr[sources + 1] - starts
+        total = int(counts.sum())
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        edges = offsets + np.arange(total, dtype=np.int64)
+        origin = np.repeat(sources, counts)
+        return edges, origin
+
+    def gather_edges(self, sources):
+        """
+        Gather the connections leaving the given source neurons.
+
+        :param sources: Sorted array of source neuron indices.
+        :return: (edges, targets, weights): the connection indices, their target neurons and a copy of their weights.
+        """
+        edges, _ = self.row_edges(sources)
+        return edges, self.indices[edges], self.weights[edges]
+
+    def scatter_weights(self, edges, weights):
+        """Set the weights of the given connections."""
+        self.weights[edges] = weights
+
+    def edge_weights(self, edges, initial=False):
+        """
+        Return the weights of the given connections.
+
+        :param edges: Array of connection indices.
+        :param initial: Return the initial weights instead of the current ones.
+        """
+        return (self.initial_weights if initial else self.weights)[edges]
+
+    def incoming_weight_totals(self, initial=False):
+        """
+        Compute the sum of the incoming weights of every target neuron.
+
+        :param initial: Sum the initial weights instead of the current ones; this sum is computed only once.
+        """
+        if not initial:
+            return np.bincount(self.indices, weights=self.weights, minlength=self.n_target)
+        if self._initial_incoming_totals is None:
+            self._initial_incoming_totals = np.bincount(self.indices, weights=self.initial_weights,
+                                                        minlength=self.n_target)
+        return self._initial_incoming_totals
+
+    def propagate(self, active):
+        """
+        Compute the incoming fire of every target neuron when the active source neurons fire.
+
+        :param active: Boolean array of length n_source, or of shape (columns, n_source) with one
+                       firing pattern per weight column, or with one firing pattern per row of a
+                       batch if there is one weight per connection.
+        :return: Incoming fire of shape (n_target,) or (columns, n_target).
+        """
+        if self.weights.ndim == 1 and active.ndim == 2:
+            edges, origin = self.row_edges(np.flatnonzero(active.any(axis=0)))
+            return batch_bincount(self.indices[edges], origin, self.weights[edges], active, self.n_target)
+        if self.weights.ndim == 1:
+            edges, _ = self.row_edges(np.flatnonzero(active))
+            return np.bincount(self.indices[edges], weights=self.weights[edges], minlength=self.n_target)
+
+        columns = self.weights.shape[1]
+        edges, origin = self.row_edges(np.flatnonzero(active.any(axis=0)))
+        contribution = self.weights[edges] * active[:, origin].T
+        slots = self.indices[edges][:, None] + self.n_target * np.arange(columns)
+        currents = np.bincount(slots.ravel(), weights=contribution.ravel(), minlength=columns * self.n_target)
+        return currents.reshape(columns, self.n_target)
+
+    def hebbian_update(self, prev_active, active, plasticity):
+        """
+        Strengthen every connection from a neuron that fired in the previous step to a neuron that fires now.
+
+        :param prev_active: Boolean firing pattern of the previous step, shaped like in propagate.
+        :param active: Boolean firing pattern of the current step over the target neurons.
+        :param plasticity: The plasticity factor, or one factor per weight column.
+        """
+        if self.weights.ndim == 1:
+            edges, _ = self.row_edges(np.flatnonzero(prev_active))
+            edges = edges[active[self.indices[edges]]]
+            self.weights[edges] *= (1 + plasticity)
+            return
+
+        edges, origin = self.row_edges(np.flatnonzero(prev_active.any(axis=0)))
+        successful = (prev_active[:, origin] & active[:, self.indices[edges]]).T
+        self.weights[edges] *= 1 + successful * np.asarray(plasticity)
+
+
+class ConnectomeCache:
+    def __init__(self, directory=None):
+        """
+        Initialize a ConnectomeCache that keeps the weights of connectomes evicted from memory.
+
+        Only the weights are kept: the topology and the initial weights of an evicted connectome are
+        regenerated from its seed when it is needed again.
+
+        :param directory: Directory the weights are saved to. If None, they are kept in memory.
+        """
+        self.directory = directory
+        self.entries = {}
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    @property
+    def nbytes(self):
+        """Memory used by the weights kept in memory in bytes; weights saved to the directory use none."""
+        if self.directory is not None:
+            return 0
+        return sum(weights.nbytes for weights in self.entries.values())
+
+    def store(self, key, weights):
+        """Keep the weights of the connectome with the given key."""
+        if self.directory is None:
+            self.entries[key] = weights
+            return
+        path = os.path.join(self.directory, "_".join(str(part) for part in key) + ".npy")
+        np.save(path, weights)
+        self.entries[key] = path
+
+    def load(self, key):
+        """Return and forget the weights of the connectome with the given key, or None if they are not cached."""
+        entry = self.entries.pop(key, None)
+        if entry is None or self.directory is None:
+            return entry
+        weights = np.load(entry)
+        os.remove(entry)
+        return weights
+
+    def clear(self):
+        """Forget all cached weights."""
+        for key in list(self.entries):
+            self.load(key)
+
+
+def k_cap(currents, k):
+    """
+    Select the k neurons with the highest incoming fire along the last axis.
+
+    Ties are broken in favour of the lower neuron index, so the result does not depend on the
+    order in which neurons are stored.
+
+    :param currents: Incoming fire of shape (..., n).
+    :param k: Size of the assembly.
+    :return: Neuron indices of shape (..., k), ordered by decreasing incoming fire.
+    """
+    currents = np.asarray(currents)
+    n = currents.shape[-1]
+    k = min(k, n)
+    if k == 0:
+        return np.zeros(currents.shape[:-1] + (0,), dtype=np.int64)
+
+    threshold = -np.partition(-currents, k - 1, axis=-1)[..., k - 1:k]
+    above = currents > threshold
+    ties = currents == threshold
+    missing = k - above.sum(axis=-1, keepdims=True)
+    selected = above | (ties & (np.cumsum(ties, axis=-1) <= missing))
+
+    winners = np.nonzero(selected)[-1].reshape(currents.shape[:-1] + (k,))
+    order = np.argsort(-np.take_along_axis(currents, winners, axis=-1), axis=-1, kind='stable')
+    return np.take_along_axis(winners, order, axis=-1)
+
+
+def batch_bincount(targets, origin, weights, active, n_target):
+    """
+    Sum the weights of the given connections into their target neurons, once per firing pattern of a batch.
+
+    Every row of the result adds up the same connections in the same order as a single propagation
+    of that row, so batched and single propagations give identical incoming fire.
+
+    :param targets: Target neuron of every connection.
+    :param origin: Source neuron of every connection.
+    :param weights: Weight of every connection.
+    :param active: Boolean firing patterns of shape (batch, n_source).
+    :param n_target: Number of target neurons.
+    :return: Incoming fire of shape (batch, n_target).
+    """
+    batch = active.shape[0]
+    fired = active[:, origin]
+    rows, connections = np.nonzero(fired)
+    slots = targets[connections] + n_target * rows
+    currents = np.bincount(slots, weights=weights[connections], minlength=batch * n_target)
+    return currents.reshape(batch, n_target)
+
+
+def random_rows(n_target, vertice_probability, seed, block, first_row, rows, allow_self_connections=True):
+    """
+    Draw one block of rows of a random connectome from the random stream of the block.
+
+    :param n_target: Number of neurons the connections end in.
+    :param vertice_probability: Probability of creating a connection between two neurons.
+    :param seed: Seed of the connectome.
+    :param block: Number of the block, which selects its random stream.
+    :param first_row: First source neuron of the block.
+    :param rows: Number of source neurons in the block.
+    :param allow_self_connections: False for connections within one area.
+    :return: (counts, indices, weights): the number of connections of every row, and the target neuron
+             and the weight of every connection of the block.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block,)))
+    row, columns = _random_positions(rng, n_target, vertice_probability, first_row, rows, allow_self_connections)
+    weights = 1 + rng.random(columns.size) * 0.5
+    return np.bincount(row, minlength=rows), columns.astype(np.int32), weights
+
+
+def _random_positions(rng, n_target, vertice_probability, first_row, rows, allow_self_connections):
+    """Draw the row within the block and the target neuron of every connection of a block of rows."""
+    positions = _bernoulli_positions(rng, rows * n_target, vertice_probability)
+    row, columns = np.divmod(positions, n_target)
+    if not allow_self_connections:
+        keep = row + first_row != columns
+        row, columns = row[keep], columns[keep]
+    return row, columns
+
+
+def _bernoulli_positions(rng, total, probability):
+    """Draw the positions of the successes in a sequence of total Bernoulli trials by sampling the gaps between them."""
+    if probability <= 0 or total == 0:
+        return np.zeros(0, dtype=np.int64)
+    if probability >= 1:
+        return np.arange(total, dtype=np.int64)
+
+    chunks = []
+    position = -1
+    batch = int(total * probability * 1.05) + 64
+    while position < total:
+        gaps = rng.geometric(probability, size=batch)
+        positions = position + np.cumsum(gaps)
+        chunks.append(positions)
+        position = positions[-1]
+    positions = np.concatenate(chunks)
+    return positions[:np.searchsorted(positions, total)]
+
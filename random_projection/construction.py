@@ -0,0 +1,148 @@
+import multiprocessing
+import secrets
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .connectome import Connectome, ROWS_PER_BLOCK, random_rows
+
+
+def random_connectomes(specs, workers=1, rows_per_block=ROWS_PER_BLOCK, cls=Connectome):
+    """
+    Generate random connectomes, splitting all of their rows into blocks that are drawn independently.
+
+    Every block of rows is drawn from its own random stream, derived from the seed of its connectome and the
+    number of the block, so neither the number of workers nor the order in which the blocks are drawn has
+    any influence on the result. With several workers, the blocks of all connectomes are shared out among
+    worker processes, which draw every block once and write it into a shared memory segment of its own.
+    The connection counts they return give the row pointers and the place of every block, and the blocks
+    are then moved into the arrays of their connectome, one segment at a time.
+
+    :param specs: (n_source, n_target, vertice_probability, seed, allow_self_connections) of every connectome.
+    :param workers: Number of worker processes.
+    :param rows_per_block: Number of rows drawn from one random stream.
+    :param cls: Class of the connectomes.
+    :return: List with one connectome per spec, with weights drawn uniformly from [1, 1.5).
+    """
+    # A missing seed is fixed once, so that all blocks use random streams of the same seed
+    specs = [(n_source, n_target, probability, np.random.SeedSequence().entropy if seed is None else seed, allow)
+             for n_source, n_target, probability, seed, allow in specs]
+    tasks = [(spec, block, first_row, min(rows_per_block, spec[0] - first_row))
+             for spec in specs for block, first_row in enumerate(range(0, spec[0], rows_per_block))]
+    if workers <= 1 or len(tasks) <= 1:
+        return _assemble(specs, tasks, [_draw(task) for task in tasks], cls)
+
+    # The segments are named here, so that they can be released even if a worker fails
+    prefix = "rc" + secrets.token_hex(6)
+    names = [f"{prefix}_{i}" for i in range(len(tasks))]
+    # Workers share the resource tracker of this process, which releases the shared memory
+    resource_tracker.ensure_running()
+    try:
+        with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+            counts = pool.map(_draw_shared, zip(tasks, names))
+        return _assemble(specs, tasks, [(count, name) for count, name in zip(counts, names)], cls)
+    finally:
+        for name in names:
+            _unlink(name)
+
+
+def random_row_blocks(spec, workers=1, rows_per_block=ROWS_PER_BLOCK):
+    """
+    Draw the blocks of rows of one random connectome in row order, with several workers drawing ahead.
+
+    :param spec: (n_source, n_target, vertice_probability, seed, allow_self_connections) of the connectome.
+    :param workers: Number of worker processes.
+    :param rows_per_block: Number of rows drawn from one random stream.
+    :return: Iterator over (first_row, counts, indices, weights) of every block of rows.
+    """
+    n_source, n_target, probability, seed, allow = spec
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    tasks = [((n_source, n_target, probability, seed, allow), block, first_row, min(rows_per_block, n_source - first_row))
+             for block, first_row in enumerate(range(0, n_source, rows_per_block))]
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield (task[2],) + _draw(task)
+        return
+    with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+        for task, part in zip(tasks, pool.imap(_draw, tasks)):
+            yield (task[2],) + part
+
+
+def _draw(task):
+    """Draw the connections of one block of rows."""
+    (n_source, n_target, probability, seed, allow), block, first_row, rows = task
+    return random_rows(n_target, probability, seed, block, first_row, rows, allow)
+
+
+def _draw_shared(job):
+    """
+    Draw one block of rows into a new shared memory segment with the given name: first the weights,
+    then the target neurons of its connections.
+
+    :return: The number of connections of every row of the block.
+    """
+    task, name = job
+    counts, indices, weights = _draw(task)
+    segment = shared_memory.SharedMemory(name=name, create=True, size=max(1, weights.nbytes + indices.nbytes))
+    block_weights, block_indices = _block_arrays(segment, weights.size)
+    block_weights[:], block_indices[:] = weights, indices
+    del block_weights, block_indices  # The segment can only be closed once no array refers to it
+    segment.close()
+    return counts
+
+
+def _block_arrays(segment, edges):
+    """The weights and the target neurons of a block of rows in its shared memory segment."""
+    weights = np.ndarray((edges,), dtype=np.float64, buffer=segment.buf)
+    indices = np.ndarray((edges,), dtype=np.int32, buffer=segment.buf, offset=weights.nbytes)
+    return weights, indices
+
+
+def _row_pointers(specs, tasks, counts):
+    """Build the row pointers of every connectome from the connection counts of its blocks, which are in row order."""
+    indptrs = []
+    for spec in specs:
+        blocks = [count for task, count in zip(tasks, counts) if task[0] is spec]
+        indptr = np.zeros(spec[0] + 1, dtype=np.int64)
+        if blocks:
+            np.cumsum(np.concatenate(blocks), out=indptr[1:])
+        indptrs.append(indptr)
+    return indptrs
+
+
+def _assemble(specs, tasks, parts, cls):
+    """
+    Put the blocks of rows together into one connectome per spec.
+
+    :param parts: (counts, indices, weights) of every block drawn in this process, or (counts, name)
+                  of every block drawn into a shared memory segment, which is unlinked once it is moved.
+    """
+    connectomes = []
+    for spec, indptr in zip(specs, _row_pointers(specs, tasks, [part[0] for part in parts])):
+        blocks = [(task, part) for task, part in zip(tasks, parts) if task[0] is spec]
+        indices = np.empty(int(indptr[-1]), dtype=np.int32)
+        weights = np.empty(int(indptr[-1]))
+        for (_, _, first_row, rows), part in blocks:
+            start, end = int(indptr[first_row]), int(indptr[first_row + rows])
+            if len(part) == 3:
+                indices[start:end], weights[start:end] = part[1], part[2]
+                continue
+            segment = shared_memory.SharedMemory(name=part[1])
+            block_weights, block_indices = _block_arrays(segment, end - start)
+            indices[start:end], weights[start:end] = block_indices, block_weights
+            del block_weights, block_indices
+            segment.close()
+            segment.unlink()
+        connectomes.append(cls(spec[0], spec[1], indptr, indices, weights))
+    return connectomes
+
+
+def _unlink(name):
+    """Release the shared memory segment with the given name, if it still exists."""
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    segment.close()
+    segment.unlink()
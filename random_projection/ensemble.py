@@ -0,0 +1,188 @@
+import random
+
+import numpy as np
+
+from .connectome import Connectome, k_cap
+from .plasticity import Hebbian, apply_rules
+
+
+class BrainEnsemble:
+    def __init__(self, seeds, num_brain_areas, neurons_per_area, vertice_probability, plasticity, assemblie_size,
+                 area_vertice_probability, plasticity_rules=None):
+        """
+        Initialize a BrainEnsemble, which runs one independent Brain per seed in the same vectorised calls.
+
+        The block of connections between two brain areas is stacked over all seeds into one block-diagonal
+        connectome, whose rows and columns are the neurons of the area in every member; the firing state of
+        every area has one row per member. Every member is generated from the seeds of the standalone Brain
+        with the same seed, and propagation, k-cap selection and plasticity add up and compare the same
+        numbers in the same order, so every member gives exactly the results of the standalone Brain.
+
+        :param seeds: Seed of every member.
+        :param num_brain_areas: Number of brain areas in every member.
+        :param neurons_per_area: Number of neurons in each brain area.
+        :param vertice_probability: Probability of creating connections between neurons and brain areas.
+        :param plasticity: The plasticity factor affecting the connection weights.
+        :param assemblie_size: Size of the neuron assemblies.
+        :param area_vertice_probability: Probability that two areas are neighbouring and therefore connected
+        :param plasticity_rules: PlasticityRules applied after every step to the connections leaving the
+                                 previous winners, by default multiplicative Hebbian potentiation.
+        """
+        self.seeds = list(seeds)
+        self.size = len(self.seeds)
+        self.num_brain_areas = num_brain_areas
+        self.neurons_per_area = neurons_per_area
+        self.vertice_probability = vertice_probability
+        self.plasticity = plasticity
+        self.assemblie_size = assemblie_size
+        self.area_vertice_probability = area_vertice_probability
+        self.plasticity_rules = [Hebbian(plasticity)] if plasticity_rules is None else plasticity_rules
+        self.blocks = {}
+        # Members that take part in the next steps; the state of the others is left unchanged
+        self.active = np.ones(self.size, dtype=bool)
+
+        self.brain_areas = [EnsembleArea(i, self) for i in range(num_brain_areas)]
+        self.neighbours = [self._draw_neighbours(seed) for seed in self.seeds]
+
+    def _draw_neighbours(self, seed):
+        """Draw the (source area ID, target area ID) pairs of neighbouring areas of one member, like the Brain does."""
+        generator = random.Random(seed)
+        neighbours = set()
+        for area_a in range(self.num_brain_areas):
+            for area_b in range(self.num_brain_areas):
+                if area_a != area_b and generator.random() < self.area_vertice_probability:
+                    neighbours.add((area_a, area_b))
+        return neighbours
+
+    def block(self, source_area, target_area):
+        """
+        Return the connections from one brain area to another in every member, building them if needed.
+
+        Members in which the areas are not neighbours have no connections in the block.
+
+        :param source_area: The brain area the connections start from.
+        :param target_area: The same brain area or a neighbouring one.
+        :return: Block-diagonal Connectome over the neurons of the areas in all members.
+        """
+        key = (source_area.ID, target_area.ID)
+        block = self.blocks.get(key)
+        if block is None:
+            # Members with the same seed have the same block, which is only built once
+            members = {}
+            for seed, neighbours in zip(self.seeds, self.neighbours):
+                if seed not in members:
+                    members[seed] = self._member_block(seed, neighbours, key)
+            block = self.blocks[key] = Connectome.stack([members[seed] for seed in self.seeds])
+        return block
+
+    def _member_block(self, seed, neighbours, key):
+        """Build the block with the given key of one member from the same seed as the standalone Brain."""
+        source_ID, target_ID = key
+        n = self.neurons_per_area
+        if source_ID != target_ID and key not in neighbours:
+            return Connectome(n, n, np.zeros(n + 1, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0))
+        return Connectome.random(n, n, self.vertice_probability, seed=[seed, source_ID, target_ID],
+                                 allow_self_connections=source_ID != target_ID)
+
+    def memory_usage(self):
+        """Return the number of bytes used by all blocks in memory."""
+        return sum(block.nbytes for block in self.blocks.values())
+
+    def reset(self):
+        """Reset the firing states, the incoming fire and the weights of every member and activate all members."""
+        self.active[:] = True
+        for area in self.brain_areas:
+            area.firing[:] = False
+            area.firing_prev[:] = False
+            area.incoming_fire[:] = 0
+        for block in self.blocks.values():
+            block.reset()
+
+
+class EnsembleArea:
+    def __init__(self, ID, ensemble):
+        """
+        Initialize an EnsembleArea, one brain area in every member of a BrainEnsemble.
+
+        The methods mirror those of BrainArea, with neuron_IDs instead of Neuron objects and one row per member.
+
+        :param ID: Identifier for the brain area.
+        :param ensemble: The BrainEnsemble that owns the connections of the brain area.
+        """
+        self.ID = ID
+        self.ensemble = ensemble
+
+        # Firing state and incoming fire of every neuron of every member
+        shape = (ensemble.size, ensemble.neurons_per_area)
+        self.firing = np.zeros(shape, dtype=bool)
+        self.firing_prev = np.zeros(shape, dtype=bool)
+        self.incoming_fire = np.zeros(shape)
+
+    def target_areas(self):
+        """The brain areas the neurons of this area are connected to in any member: the area itself and its neighbours."""
+        neighbours = set().union(*self.ensemble.neighbours)
+        return [self] + [area for area in self.ensemble.brain_areas if (self.ID, area.ID) in neighbours]
+
+    def assemblie_fire(self):
+        """
+        Fire the k-cap assembly of every active member and update the weights, like BrainArea.assemblie_fire.
+
+        :return: neuron_IDs of the k-cap of every member, of shape (members, assemblie_size); rows of
+                 inactive members are not fired.
+        """
+        caps = self.make_k_cap(self.ensemble.assemblie_size)
+        self.reset_neurons_firing_state()
+        self.fire_indices(caps)
+        self.update_connections_weight()
+        return caps
+
+    def assemblie_fire_custom(self, indices):
+        """
+        Fire the given neurons of every active member and update the weights, like BrainArea.assemblie_fire_custom.
+
+        :param indices: neuron_IDs of the neurons that fire, of shape (members, number of neurons).
+        :return: The neuron_IDs that were fired.
+        """
+        self.reset_neurons_firing_state()
+        self.fire_indices(indices)
+        self.update_connections_weight()
+        return indices
+
+    def fire_indices(self, indices):
+        """
+        Set the given neurons of every active member to firing state and propagate their fire to the
+        connected neurons of this area and of the neighbouring areas.
+
+        :param indices: neuron_IDs of the neurons that fire, of shape (members, number of neurons).
+        """
+        fired = np.zeros_like(self.firing)
+        np.put_along_axis(fired, np.asarray(indices, dtype=np.int64), True, axis=1)
+        fired &= self.ensemble.active[:, None]
+        self.firing |= fired
+        for target_area in self.target_areas():
+            currents = self.ensemble.block(self, target_area).propagate(fired.ravel())
+            target_area.incoming_fire += currents.reshape(self.incoming_fire.shape)
+
+    def make_k_cap(self, assemblie_size):
+        """Create the k-cap assembly of every member, as neuron_IDs of shape (members, assemblie_size)."""
+        return k_cap(self.incoming_fire, assemblie_size)
+
+    def reset_neurons_firing_state(self):
+        """Reset the firing state of all neurons of the active members."""
+        active = self.ensemble.active
+        self.firing_prev[active] = self.firing[active]
+        self.firing[active] = False
+        self.incoming_fire[active] = 0
+
+    def update_connections_weight(self, rules=None):
+        """
+        Update the weight of the connections leaving the neurons that fired in the previous step in every active member.
+
+        :param rules: PlasticityRules to apply, by default the plasticity rules of the ensemble.
+        """
+        prev_active = self.firing_prev & self.ensemble.active[:, None]
+        if not prev_active.any():
+            return
+        for target_area in self.target_areas():
+            apply_rules(self.ensemble.plasticity_rules if rules is None else rules,
+                        self.ensemble.block(self, target_area), prev_active.ravel(), target_area.firing.ravel())
@@ -0,0 +1,173 @@
+import numpy as np
+
+from .connectome import k_cap
+
+# Number of neurons per neuron of the cap above which ranking all neurons costs more than keeping the cap
+MIN_NEURONS_PER_WINNER = 64
+
+
+def worthwhile(n, assemblie_size):
+    """Whether an IncrementalCap is faster than ranking all n neurons in every step."""
+    return n >= MIN_NEURONS_PER_WINNER * assemblie_size
+
+
+class IncrementalCap:
+    def __init__(self, connectome, assemblie_size, weights=None, reserve=None, resync_interval=64, tolerance=1e-9):
+        """
+        Initialize an IncrementalCap, which keeps the incoming fire of the target neurons of a connectome
+        and selects its k-cap without ranking all neurons in every step.
+
+        When the firing pattern changes, only the connections of the neurons that started or stopped
+        firing change the incoming fire, and when weights change, only the connections that leave the
+        firing neurons do. The incoming fire is updated by these differences, and the k-cap is selected
+        from a pool of the best assemblie_size + reserve neurons and a bound on the incoming fire of all
+        others. The pool is only rebuilt from all neurons when a neuron outside of it could enter the cap.
+
+        Neurons near the threshold of the cap get their exact incoming fire, summed in the same order as
+        Connectome.propagate, so the cap is always exactly k_cap of the propagated incoming fire.
+
+        :param connectome: Connectome of the connections into the neurons that are capped.
+        :param assemblie_size: Size of the neuron assemblies.
+        :param weights: Weight of every connection, by default the weights of the connectome. The array
+                        is read whenever the cap needs the weights, so it can be a view that changes.
+        :param reserve: Number of neurons kept in the pool besides the cap, by default assemblie_size.
+        :param resync_interval: Number of steps after which the incoming fire is propagated again from
+                                scratch, so that rounding errors of the differences cannot grow.
+        :param tolerance: Bound on the relative rounding error of the incoming fire between two resyncs.
+        """
+        self.connectome = connectome
+        self.assemblie_size = assemblie_size
+        self.weights = connectome.weights if weights is None else weights
+        self.reserve = assemblie_size if reserve is None else reserve
+        self.resync_interval = resync_interval
+        self.tolerance = tolerance
+        self.steps = 0
+
+        self.active = np.zeros(connectome.n_source, dtype=bool)
+        self.currents = np.zeros(connectome.n_target)  # Incoming fire, up to rounding errors
+        self.exact = np.zeros(connectome.n_target)  # Exact incoming fire of the neurons that are not stale
+        self.stale = np.zeros(connectome.n_target, dtype=bool)
+        self._changed = []
+        self._pool = None
+        self._in_pool = np.zeros(connectome.n_target, dtype=bool)
+        self._bound = -np.inf
+        self._slots = np.full(connectome.n_target, -1, dtype=np.int64)
+
+    def fire(self, active):
+        """
+        Change the firing pattern of the source neurons and update the incoming fire by the connections
+        of the neurons that started or stopped firing.
+
+        :param active: Boolean firing pattern over the source neurons.
+        """
+        entered = np.flatnonzero(active & ~self.active)
+        left = np.flatnonzero(self.active & ~active)
+        self.active = active.copy()
+        self.steps += 1
+        if self.steps % self.resync_interval == 0:
+            self.resync()
+            return
+
+        entered_edges, _ = self.connectome.row_edges(entered)
+        left_edges, _ = self.connectome.row_edges(left)
+        edges = np.concatenate([entered_edges, left_edges])
+        deltas = np.concatenate([self.weights[entered_edges], -self.weights[left_edges]])
+        self._add(self.connectome.indices[edges], deltas)
+
+    def weights_changed(self, edges, before):
+        """
+        Update the incoming fire after the weights of the given connections have changed.
+
+        :param edges: Indices of the connections whose weights have changed.
+        :param before: Their weights before the change.
+        """
+        edges = np.asarray(edges, dtype=np.int64)
+        sources = np.searchsorted(self.connectome.indptr, edges, side='right') - 1
+        firing = self.active[sources]
+        edges = edges[firing]
+        self._add(self.connectome.indices[edges], self.weights[edges] - np.asarray(before)[firing])
+
+    def _add(self, targets, deltas):
+        """Add differences to the incoming fire of the given target neurons, which makes their exact incoming fire stale."""
+        if targets.size == 0:
+            return
+        np.add.at(self.currents, targets, deltas)
+        self.stale[targets] = True
+        self._changed.append(targets)
+
+    def resync(self):
+        """Propagate the incoming fire of the current firing pattern again from scratch."""
+        edges, _ = self.connectome.row_edges(np.flatnonzero(self.active))
+        self.exact = np.bincount(self.connectome.indices[edges], weights=self.weights[edges],
+                                 minlength=self.connectome.n_target)
+        self.currents = self.exact.copy()
+        self.stale[:] = False
+        self._changed = []
+        self._pool = None
+
+    def _refresh(self, neurons):
+        """
+        Compute the exact incoming fire of the given stale target neurons from the connections of the firing
+        neurons, added up in the same order as in propagate.
+        """
+        neurons = neurons[self.stale[neurons]]
+        if neurons.size == 0:
+            return
+        edges, _ = self.connectome.row_edges(np.flatnonzero(self.active))
+        targets = self.connectome.indices[edges]
+        self._slots[neurons] = np.arange(neurons.size)
+        wanted = self._slots[targets] >= 0
+        self.exact[neurons] = np.bincount(self._slots[targets[wanted]], weights=self.weights[edges[wanted]],
+                                          minlength=neurons.size)
+        self._slots[neurons] = -1
+        self.currents[neurons] = self.exact[neurons]
+        self.stale[neurons] = False
+
+    def _rebuild_pool(self):
+        """Put the assemblie_size + reserve neurons with the highest incoming fire into the pool."""
+        n = self.connectome.n_target
+        size = min(n, self.assemblie_size + self.reserve)
+        pool = np.argpartition(-self.currents, size - 1)[:size] if size < n else np.arange(n)
+        self._pool = np.sort(pool)
+        self._in_pool[:] = False
+        self._in_pool[self._pool] = True
+        self._bound = self.currents[~self._in_pool].max() if size < n else -np.inf
+        self._changed = []
+
+    def cap(self):
+        """
+        Select the k-cap of the current incoming fire.
+
+        :return: Neuron indices of the cap, ordered by decreasing incoming fire, exactly like k_cap.
+        """
+        n = self.connectome.n_target
+        k = min(self.assemblie_size, n)
+        if k == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        if self._pool is None or self._pool.size > 4 * (self.assemblie_size + self.reserve):
+            self._rebuild_pool()
+        elif self._changed:
+            # Neurons outside of the pool whose incoming fire rose above the bound join the pool
+            changed = np.unique(np.concatenate(self._changed))
+            self._changed = []
+            joining = changed[~self._in_pool[changed] & (self.currents[changed] > self._bound)]
+            if joining.size:
+                self._pool = np.union1d(self._pool, joining)
+                self._in_pool[joining] = True
+
+        for attempt in range(2):
+            values = self.currents[self._pool]
+            kth = -np.partition(-values, k - 1)[k - 1]
+            margin = 2 * self.tolerance * max(1.0, np.abs(values).max())
+            if kth - margin > self._bound:
+                # Every neuron outside of the candidates has less incoming fire than k neurons of the pool
+                candidates = self._pool[values >= kth - margin]
+                self._refresh(candidates)
+                return candidates[k_cap(self.exact[candidates], k)]
+            if attempt == 0:
+                self._rebuild_pool()
+
+        # The pool cannot separate the cap from the other neurons, for example because of many ties
+        self._refresh(np.arange(n))
+        return k_cap(self.exact, k)
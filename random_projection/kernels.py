@@ -0,0 +1,113 @@
+"""
+Fused kernel for one assemblie_fire step of a single brain area: k-cap selection, propagation of the
+fire of the cap and the Hebbian update of the connections from the previous to the current winners.
+
+The kernel is compiled with numba if it is installed. Otherwise the same step runs as separate numpy
+operations, with identical results.
+"""
+import numpy as np
+
+from .connectome import k_cap
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+JIT_AVAILABLE = numba is not None
+
+
+def assemblie_fire(connectome, incoming_fire, firing, firing_prev, plasticity, assemblie_size, use_jit=None):
+    """
+    Fire the k-cap of the incoming fire of a brain area and update the weights, in place.
+
+    :param connectome: Connectome of the connections within the brain area, with one weight per connection.
+    :param incoming_fire: Incoming fire of every neuron; replaced by the incoming fire caused by the cap.
+    :param firing: Firing state of every neuron; replaced by the cap.
+    :param firing_prev: Previous firing state of every neuron; replaced by the old firing state.
+    :param plasticity: The plasticity factor affecting the connection weights.
+    :param assemblie_size: Size of the neuron assemblies.
+    :param use_jit: Use the compiled kernel; by default whenever numba is installed.
+    :return: Indices of the neurons of the cap, ordered by decreasing incoming fire.
+    """
+    if use_jit is None:
+        use_jit = JIT_AVAILABLE
+    if use_jit:
+        cap = np.empty(min(assemblie_size, incoming_fire.size), dtype=np.int64)
+        _fused_assemblie_fire(connectome.indptr, connectome.indices, connectome.weights,
+                              incoming_fire, firing, firing_prev, plasticity, cap)
+        return cap
+
+    cap = k_cap(incoming_fire, assemblie_size)
+    firing_prev[:] = firing
+    firing[:] = False
+    firing[cap] = True
+    incoming_fire[:] = connectome.propagate(firing)
+    connectome.hebbian_update(firing_prev, firing, plasticity)
+    return cap
+
+
+def _ranks_below(values, a, b):
+    """True if neuron a ranks below neuron b: less incoming fire, or as much and a higher index."""
+    return values[a] < values[b] or (values[a] == values[b] and a > b)
+
+
+def _sift_down(heap, values, root, size):
+    """Restore the heap below root, which keeps the lowest ranked neuron at the top."""
+    while True:
+        child = 2 * root + 1
+        if child >= size:
+            return
+        if child + 1 < size and _ranks_below(values, heap[child + 1], heap[child]):
+            child += 1
+        if not _ranks_below(values, heap[child], heap[root]):
+            return
+        heap[root], heap[child] = heap[child], heap[root]
+        root = child
+
+
+def _select(values, cap):
+    """Write the len(cap) highest ranked neurons into cap, ordered from highest to lowest rank, using a heap."""
+    k = cap.size
+    for i in range(k):
+        cap[i] = i
+    for root in range(k // 2 - 1, -1, -1):
+        _sift_down(cap, values, root, k)
+    for i in range(k, values.size):
+        if _ranks_below(values, cap[0], i):
+            cap[0] = i
+            _sift_down(cap, values, 0, k)
+    for size in range(k - 1, 0, -1):
+        cap[0], cap[size] = cap[size], cap[0]
+        _sift_down(cap, values, 0, size)
+
+
+def _fused_assemblie_fire(indptr, indices, weights, incoming_fire, firing, firing_prev, plasticity, cap):
+    """Select the cap, fire it and apply the Hebbian update in one pass, without allocating any array."""
+    if cap.size > 0:
+        _select(incoming_fire, cap)
+
+    n = incoming_fire.size
+    for i in range(n):
+        firing_prev[i] = firing[i]
+        firing[i] = False
+        incoming_fire[i] = 0.0
+    for i in range(cap.size):
+        firing[cap[i]] = True
+
+    factor = 1 + plasticity
+    for source in range(n):
+        if firing[source]:
+            for edge in range(indptr[source], indptr[source + 1]):
+                incoming_fire[indices[edge]] += weights[edge]
+        if firing_prev[source]:
+            for edge in range(indptr[source], indptr[source + 1]):
+                if firing[indices[edge]]:
+                    weights[edge] *= factor
+
+
+if JIT_AVAILABLE:
+    _ranks_below = numba.njit(cache=True)(_ranks_below)
+    _sift_down = numba.njit(cache=True)(_sift_down)
+    _select = numba.njit(cache=True)(_select)
+    _fused_assemblie_fire = numba.njit(cache=True)(_fused_assemblie_fire)
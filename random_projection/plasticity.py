@@ -0,0 +1,131 @@
+import numpy as np
+
+
+class ActiveEdges:
+    def __init__(self, block, prev_active, active):
+        """
+        Gather the connections of a block that leave the neurons that fired in the previous step.
+
+        All plasticity rules of a step work on this one gathered weight vector, so the cost of a step
+        is proportional to the number of these connections and independent of the size of the areas.
+
+        :param block: Connectome of the connections from one brain area to another.
+        :param prev_active: Boolean firing pattern of the previous step over the source neurons.
+        :param active: Boolean firing pattern of the current step over the target neurons.
+        """
+        self.block = block
+        self.edges, self.targets, self.weights = block.gather_edges(np.flatnonzero(prev_active))
+        self.before = self.weights.copy()
+        # Connections that led to the firing of the connected neuron
+        self.successful = active[self.targets]
+
+
+class PlasticityRule:
+    """A plasticity rule, which changes the weights of the connections leaving the previous winners."""
+
+    def apply(self, step):
+        """
+        Change the gathered weights of one step in place.
+
+        :param step: ActiveEdges of the step.
+        """
+        raise NotImplementedError
+
+
+class Hebbian(PlasticityRule):
+    def __init__(self, plasticity):
+        """
+        Multiplicative Hebbian potentiation of the connections that led to the firing of the connected neuron.
+
+        :param plasticity: The plasticity factor affecting the connection weights.
+        """
+        self.plasticity = plasticity
+
+    def apply(self, step):
+        step.weights[step.successful] *= (1 + self.plasticity)
+
+
+class Fading(PlasticityRule):
+    def __init__(self, plasticity, minimum=1):
+        """
+        Fading of the connections that have been activated but did not lead to the firing of the connected neuron.
+
+        :param plasticity: The plasticity factor affecting the connection weights.
+        :param minimum: Weight below which a connection does not fade.
+        """
+        self.plasticity = plasticity
+        self.minimum = minimum
+
+    def apply(self, step):
+        unsuccessful = ~step.successful
+        step.weights[unsuccessful] = np.maximum(self.minimum, step.weights[unsuccessful] / (1 + self.plasticity))
+
+
+class Normalisation(PlasticityRule):
+    def __init__(self, total=None):
+        """
+        Normalisation of the incoming weights of every neuron the previous winners are connected to.
+
+        Only the connections leaving the previous winners are rescaled, such that the sum of all
+        incoming weights of each of their target neurons equals the total again.
+
+        :param total: Sum of the incoming weights of every neuron, or None to keep the initial sum of each neuron.
+        """
+        self.total = total
+
+    def apply(self, step):
+        block = step.block
+        if block.incoming_totals is None:
+            block.incoming_totals = block.incoming_weight_totals()
+        goal = block.incoming_weight_totals(initial=True) if self.total is None else self.total
+
+        # Only the target neurons of the gathered connections are touched, so a step does not depend on n_target
+        targets, inverse = np.unique(step.targets, return_inverse=True)
+        current = block.incoming_totals[targets] + np.bincount(inverse, step.weights - step.before,
+                                                               minlength=targets.size)
+        active = np.bincount(inverse, step.weights, minlength=targets.size)
+        scaled = active != 0
+        goal = goal[targets[scaled]] if np.ndim(goal) else goal
+
+        factor = np.ones(targets.size)
+        factor[scaled] = np.maximum(0, goal - (current[scaled] - active[scaled])) / active[scaled]
+        step.weights *= factor[inverse]
+
+
+class WeightCap(PlasticityRule):
+    def __init__(self, maximum):
+        """
+        Upper bound on the weight of the connections.
+
+        :param maximum: The largest weight a connection can have.
+        """
+        self.maximum = maximum
+
+    def apply(self, step):
+        np.minimum(step.weights, self.maximum, out=step.weights)
+
+
+def apply_rules(rules, block, prev_active, active):
+    """
+    Apply plasticity rules, in the given order, to the connections of a block that leave the neurons
+    that fired in the previous step, and write the changed weights back.
+
+    :param rules: The PlasticityRules to apply.
+    :param block: Connectome of the connections from one brain area to another.
+    :param prev_active: Boolean firing pattern of the previous step over the source neurons.
+    :param active: Boolean firing pattern of the current step over the target neurons.
+    :return: The ActiveEdges of the step, with the weights before and after the rules, or None if no neuron fired.
+    """
+    if not prev_active.any():
+        return None
+    step = ActiveEdges(block, prev_active, active)
+    for rule in rules:
+        rule.apply(step)
+
+    changed = step.weights != step.before
+    if block.incoming_totals is not None:
+        targets, inverse = np.unique(step.targets[changed], return_inverse=True)
+        block.incoming_totals[targets] += np.bincount(inverse, (step.weights - step.before)[changed],
+                                                      minlength=targets.size)
+    block.scatter_weights(step.edges[changed], step.weights[changed])
+    return step
@@ -0,0 +1,66 @@
+import logging
+
+from .sweep import PlasticitySweep
+
+# Configurable Constants
+n = 10000 # The number of neurons per brain area
+k = 100 # the assemblie size or group of neurons in the model
+
+Seed =1
+
+# the different plasticity parameters
+parameters =[0,0.001,0.003,0.007,0.015,0.031,0.063,0.127,0.255,0.511]
+
+
+def run_experiment(n=n, k=k, seed=Seed, plasticities=parameters, vertice_probability=0.01, iterations=100):
+    """
+    Computes the total support of a stimulus fired repeatedly together with its k-cap, for every
+    plasticity parameter.
+
+    The topology of the area is built once and shared by all plasticity parameters, which advance
+    in lockstep with one weight column each.
+
+    :param n: The number of neurons per brain area.
+    :param k: The assemblie size.
+    :param seed: Seed for random number generator.
+    :param plasticities: The plasticity parameters to compare.
+    :param vertice_probability: Probability of creating connections between neurons.
+    :param iterations: Number of times the stimulus and the k-cap are fired.
+    :return: dict with the parameters and the total support after every iteration per plasticity parameter.
+    """
+    import numpy as np
+
+    Sweep = PlasticitySweep.random(seed=seed,
+                                   neurons_per_area=n,
+                                   vertice_probability=vertice_probability,
+                                   plasticities=plasticities,
+                                   assemblie_size=k)
+
+    #create the stimulus
+    Stimulus = np.random.default_rng(seed).choice(n, size=k, replace=False)
+
+    #support is the number of all the neurons that have fired due to the stimulus
+    support = Sweep.run_support(Stimulus, iterations)
+
+    return {"n": n, "k": k, "seed": seed, "iterations": iterations,
+            "plasticities": list(plasticities),
+            "support": support.tolist()}
+
+
+def make_plot(**parameters):
+    """Plots the total support per plasticity parameter, passing the parameters on to run_experiment."""
+    import matplotlib.pyplot as plt
+
+    result = run_experiment(**parameters)
+    for plasticity, plot in zip(result["plasticities"], result["support"]):
+        plt.xlabel('#iterations')
+        plt.ylabel('total support')
+        plt.plot(range(result["iterations"] + 1), plot, '-', label=str(plasticity))
+
+    plt.legend()
+    plt.show()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    make_plot()
@@ -0,0 +1,153 @@
+import os
+
+import numpy as np
+
+
+class FiringRecorder:
+    def __init__(self, spill_directory=None, steps_in_memory=4096):
+        """
+        Initialize a FiringRecorder that logs the neurons fired in every step of every brain area.
+
+        Each step is stored as a bit-packed row of the firing raster, so a step of an area with n
+        neurons takes n/8 bytes. The statistics of the assembly dynamics are updated incrementally
+        when a step is recorded and never require a pass over the raster.
+
+        :param spill_directory: Directory the raster rows are appended to once steps_in_memory steps
+                                of an area are buffered. If None, the raster is kept in memory. A raster
+                                file that is already in the directory is never overwritten.
+        :param steps_in_memory: Number of steps per area buffered in memory.
+        """
+        self.spill_directory = spill_directory
+        self.steps_in_memory = steps_in_memory
+        self.areas = {}
+
+    def record(self, area_ID, num_neurons, fired):
+        """
+        Record one step of a brain area.
+
+        :param area_ID: Identifier of the brain area.
+        :param num_neurons: Number of neurons in the brain area.
+        :param fired: Indices of the neurons that fired in this step.
+        """
+        raster = self.areas.get(area_ID)
+        if raster is None:
+            path = None
+            if self.spill_directory is not None:
+                os.makedirs(self.spill_directory, exist_ok=True)
+                path = os.path.join(self.spill_directory, f"area_{area_ID}.raster")
+            raster = _AreaRaster(num_neurons, self.steps_in_memory, path)
+            self.areas[area_ID] = raster
+        raster.record(np.asarray(fired, dtype=np.int64))
+
+    def raster(self, area_ID):
+        """Return the firing raster of a brain area as a boolean array of shape (steps, neurons)."""
+        return self.areas[area_ID].unpack()
+
+    def steps(self, area_ID):
+        """Return the number of steps recorded for a brain area."""
+        return self.areas[area_ID].steps
+
+    def support_size(self, area_ID):
+        """Return the number of distinct neurons of a brain area that have fired so far."""
+        return self.areas[area_ID].support_size
+
+    def total_support(self):
+        """Return the number of distinct neurons that have fired so far in all brain areas."""
+        return sum(raster.support_size for raster in self.areas.values())
+
+    def support_growth(self, area_ID):
+        """Return the support size of a brain area after every recorded step."""
+        return np.array(self.areas[area_ID].support_growth, dtype=np.int64)
+
+    def firing_counts(self, area_ID):
+        """Return how often every neuron of a brain area has fired."""
+        return self.areas[area_ID].firing_counts.copy()
+
+    def churn(self, area_ID):
+        """Return the number of neurons that entered the fired set in every step compared to the step before."""
+        return np.array(self.areas[area_ID].churn, dtype=np.int64)
+
+    def stability(self, area_ID):
+        """Return the fraction of the fired set that also fired in the step before, for every step."""
+        return np.array(self.areas[area_ID].stability)
+
+    def close(self):
+        """Write all buffered steps to the spill directory."""
+        for raster in self.areas.values():
+            raster.flush()
+
+
+class _AreaRaster:
+    def __init__(self, num_neurons, steps_in_memory, path):
+        """
+        Bit-packed firing raster and incremental statistics of one brain area.
+
+        :param num_neurons: Number of neurons in the brain area.
+        :param steps_in_memory: Number of steps buffered in memory.
+        :param path: File the buffered steps are appended to, or None to keep them in memory. The file
+                     must not exist yet, so that the raster of an earlier recorder is not lost.
+        """
+        if path is not None and os.path.exists(path):
+            raise FileExistsError(f"{path} already holds a raster; record into another spill directory")
+        self.num_neurons = num_neurons
+        self.path = path
+        self.row_bytes = (num_neurons + 7) // 8
+        self.buffer = np.zeros((steps_in_memory, self.row_bytes), dtype=np.uint8)
+        self.buffered = 0
+        self.chunks = []
+        self.spilled = 0
+        self.steps = 0
+
+        self.support = np.zeros(num_neurons, dtype=bool)
+        self.support_size = 0
+        self.support_growth = []
+        self.firing_counts = np.zeros(num_neurons, dtype=np.int64)
+        self.previous = np.zeros(num_neurons, dtype=bool)
+        self.churn = []
+        self.stability = []
+
+    def record(self, fired):
+        """Append one step and update the statistics."""
+        mask = np.zeros(self.num_neurons, dtype=bool)
+        mask[fired] = True
+        fired = np.flatnonzero(mask)
+
+        if self.buffered == len(self.buffer):
+            self.flush()
+        self.buffer[self.buffered] = np.packbits(mask)
+        self.buffered += 1
+        self.steps += 1
+
+        new = fired[~self.support[fired]]
+        self.support[new] = True
+        self.support_size += new.size
+        self.support_growth.append(self.support_size)
+        self.firing_counts[fired] += 1
+
+        retained = int(self.previous[fired].sum())
+        self.churn.append(fired.size - retained)
+        self.stability.append(retained / fired.size if fired.size else 1.0)
+        self.previous[:] = False
+        self.previous[fired] = True
+
+    def flush(self):
+        """Move the buffered steps to the spill file, or to the in-memory chunks if there is none."""
+        if self.buffered == 0:
+            return
+        if self.path is None:
+            self.chunks.append(self.buffer[:self.buffered].copy())
+        else:
+            with open(self.path, "ab") as file:
+                self.buffer[:self.buffered].tofile(file)
+            self.spilled += self.buffered
+        self.buffered = 0
+
+    def unpack(self):
+        """Return the whole raster as a boolean array of shape (steps, neurons)."""
+        parts = []
+        if self.spilled:
+            parts.append(np.memmap(self.path, dtype=np.uint8, mode="r", shape=(self.spilled, self.row_bytes)))
+        parts.extend(self.chunks)
+        parts.append(self.buffer[:self.buffered])
+        packed = np.concatenate(parts)
+        return np.unpackbits(packed, axis=1, count=self.num_neurons).astype(bool)
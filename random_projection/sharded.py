@@ -0,0 +1,371 @@
+import multiprocessing
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .connectome import Connectome, ROWS_PER_BLOCK, k_cap, random_rows
+
+
+class ShardedConnectome(Connectome):
+    def __init__(self, n_source, n_target, vertice_probability, seed, allow_self_connections=True, workers=2,
+                 rows_per_block=ROWS_PER_BLOCK):
+        """
+        Initialize a ShardedConnectome, a random connectome whose rows are partitioned across worker processes.
+
+        Every worker owns a contiguous range of source neurons made of whole blocks of rows, and draws the
+        connections of its rows itself with random_rows, so the connectome is identical to Connectome.random
+        with the same seed and block size. A worker reports the connection counts of its rows and then moves
+        its blocks of rows, one after another, into arrays in multiprocessing.shared_memory, so no process
+        ever holds more than its own rows and the connectome is never copied as a whole.
+
+        This process sees all connections through the shared arrays, so gathering and scattering weights and
+        the plasticity rules work like on any Connectome. A propagation is split among the workers: each of
+        them writes the partial incoming fire caused by the firing neurons of its rows, and the partial
+        vectors are summed, so the incoming fire may differ from Connectome.propagate by rounding.
+
+        The workers only receive small command tuples over a multiprocessing Connection and find all bulk
+        data in named shared buffers, so a worker on another host would need a Listener/Client connection
+        and its own copy of the buffers, but no change to the protocol. If a worker fails, the remaining
+        workers are stopped and all shared memory is released.
+
+        :param n_source: Number of neurons the connections start from.
+        :param n_target: Number of neurons the connections end in.
+        :param vertice_probability: Probability of creating a connection between two neurons.
+        :param seed: Seed for random number generator.
+        :param allow_self_connections: False for connections within one area, where a neuron is never connected to itself.
+        :param workers: Number of worker processes.
+        :param rows_per_block: Number of rows drawn from one random stream.
+        """
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.n_source = n_source
+        self.n_target = n_target
+        self.workers = workers
+        blocks = -(-n_source // rows_per_block)
+        self.bounds = np.minimum(np.linspace(0, blocks, workers + 1).astype(np.int64) * rows_per_block, n_source)
+        self._segments = []
+        self._names = {}
+        self.processes = []
+        self.connections = []
+        # Stops the workers and releases the shared memory even if close is never called
+        self._finalizer = weakref.finalize(self, _release, self._segments, self.processes, self.connections)
+        try:
+            arrays = self._start((vertice_probability, seed, allow_self_connections, rows_per_block))
+        except BaseException:
+            self.close()
+            raise
+        super().__init__(n_source, n_target, *arrays)
+
+    def _start(self, draw):
+        """
+        Start one worker process per shard, let every worker draw its rows and move them into shared arrays.
+
+        :param draw: (vertice_probability, seed, allow_self_connections, rows_per_block) of the connectome.
+        :return: (indptr, indices, initial_weights, weights) in shared memory.
+        """
+        self.source_firing = self._shared((self.n_source,), bool)
+        self.target_firing = self._shared((self.n_target,), bool)
+        self.partial = self._shared((self.workers, self.n_target), float)
+        self.incoming_fire = self._shared((self.n_target,), float)
+
+        buffers = {name: self._spec(name) for name in ("source_firing", "target_firing", "partial", "incoming_fire")}
+        for worker in range(self.workers):
+            spec = dict(buffers=buffers, worker=worker, lo=int(self.bounds[worker]), hi=int(self.bounds[worker + 1]),
+                        n_target=self.n_target, draw=draw)
+            parent, child = multiprocessing.Pipe()
+            self.connections.append(parent)
+            process = multiprocessing.Process(target=_serve, args=(spec, child), daemon=True)
+            process.start()
+            self.processes.append(process)
+
+        # The connection counts of all rows give the row pointers and the place of the rows of every worker
+        counts = self._gather()
+        indptr = self._shared((self.n_source + 1,), np.int64)
+        np.cumsum(np.concatenate(counts), out=indptr[1:])
+        indices = self._shared((int(indptr[-1]),), np.int32)
+        initial_weights = self._shared((int(indptr[-1]),), float)
+        weights = self._shared((int(indptr[-1]),), float)
+        arrays = {"indptr": indptr, "indices": indices, "initial_weights": initial_weights, "weights": weights}
+        self._broadcast(("store", {name: self._spec_of(array) for name, array in arrays.items()}))
+        return indptr, indices, initial_weights, weights
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def nbytes(self):
+        """Memory used by the topology, all weights and the buffers shared with the workers in bytes."""
+        buffers = self.source_firing.nbytes + self.target_firing.nbytes + self.partial.nbytes + self.incoming_fire.nbytes
+        return super().nbytes + buffers
+
+    def propagate(self, active):
+        """
+        Compute the incoming fire of every target neuron when the active source neurons fire.
+
+        A single firing pattern is propagated by the workers, each over its own rows; a batch of firing
+        patterns is propagated in this process, like by Connectome.propagate.
+
+        :param active: Boolean array of length n_source, or of shape (batch, n_source).
+        :return: Incoming fire of shape (n_target,) or (batch, n_target).
+        """
+        if active.ndim == 2:
+            return super().propagate(active)
+        self._spread(active)
+        return self.partial.sum(axis=0)
+
+    def hebbian_update(self, prev_active, active, plasticity):
+        """
+        Strengthen every connection from a neuron that fired in the previous step to a neuron that fires now,
+        with every worker updating the connections of its own rows.
+
+        :param prev_active: Boolean firing pattern of the previous step over the source neurons.
+        :param active: Boolean firing pattern of the current step over the target neurons.
+        :param plasticity: The plasticity factor.
+        """
+        if prev_active.ndim == 2:
+            return super().hebbian_update(prev_active, active, plasticity)
+        self.source_firing[:] = prev_active
+        self.target_firing[:] = active
+        self._broadcast(("hebbian", plasticity))
+
+    def close(self):
+        """Stop the worker processes and release the shared memory. The connectome cannot be used afterwards."""
+        # The shared memory can only be closed once no array refers to it
+        self.indptr = self.indices = self.initial_weights = self.weights = None
+        self.source_firing = self.target_firing = self.partial = self.incoming_fire = None
+        self._names = {}
+        self._finalizer()
+
+    def _spread(self, active):
+        """Let every worker write the partial incoming fire caused by the active source neurons of its rows."""
+        self.source_firing[:] = active
+        self._broadcast(("propagate",))
+
+    def _broadcast(self, command):
+        """
+        Send a command to all workers and wait until every worker has finished it.
+        If a worker has failed, all workers are stopped and the shared memory is released.
+
+        :return: The reply of every worker.
+        """
+        try:
+            for connection in self.connections:
+                connection.send(command)
+            return self._gather()
+        except BaseException:
+            self.close()
+            raise
+
+    def _gather(self):
+        """Receive one reply from every worker."""
+        return [connection.recv() for connection in self.connections]
+
+    def _shared(self, shape, dtype):
+        """Allocate a zeroed array in shared memory."""
+        dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+        segment = shared_memory.SharedMemory(create=True, size=size)
+        self._segments.append(segment)
+        array = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+        array[...] = 0
+        self._names[id(array)] = segment.name
+        return array
+
+    def _spec(self, attribute):
+        """Describe a shared array attribute so a worker can attach to it."""
+        return self._spec_of(getattr(self, attribute))
+
+    def _spec_of(self, array):
+        """Describe a shared array by the name of its segment, its shape and its dtype."""
+        return self._names[id(array)], array.shape, array.dtype.str
+
+
+class ShardedArea:
+    def __init__(self, neurons, vertice_probability, seed, assemblie_size, plasticity, workers=2,
+                 rows_per_block=ROWS_PER_BLOCK):
+        """
+        Initialize a ShardedArea, a brain area whose neurons are partitioned across worker processes.
+
+        The connections within the area are a ShardedConnectome, drawn like the block of a Brain area with
+        Connectome.random. Every worker owns a contiguous range of neurons: their rows of the connectivity,
+        i.e. their outgoing connections and weights, and their slice of the k-cap selection. In every step
+        each worker writes the partial incoming fire caused by its own firing neurons, then sums the partial
+        vectors over its slice of neurons and proposes its local top-k candidates, from which the global
+        k-cap is merged.
+
+        A ShardedArea runs a single area on its own, with multiplicative Hebbian plasticity. To shard the
+        connections within the areas of a Brain, which keeps its k-cap selection in one process, pass
+        shards to the Brain.
+
+        :param neurons: Number of neurons in the brain area.
+        :param vertice_probability: Probability of creating connections between neurons.
+        :param seed: Seed for random number generator.
+        :param assemblie_size: Size of the neuron assemblies.
+        :param plasticity: The plasticity factor affecting the connection weights.
+        :param workers: Number of worker processes.
+        :param rows_per_block: Number of rows drawn from one random stream.
+        """
+        self.n = neurons
+        self.assemblie_size = assemblie_size
+        self.plasticity = plasticity
+        self.firing = np.zeros(neurons, dtype=bool)
+        self.firing_prev = np.zeros(neurons, dtype=bool)
+        self.connectome = ShardedConnectome(neurons, neurons, vertice_probability, seed, allow_self_connections=False,
+                                            workers=workers, rows_per_block=rows_per_block)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def incoming_fire(self):
+        """Incoming fire of every neuron, as summed by the workers in the last k-cap selection."""
+        return self.connectome.incoming_fire
+
+    def fire(self, fired):
+        """
+        Fire the given neurons and update the weights, like BrainArea.assemblie_fire_custom.
+
+        :param fired: Indices of the neurons that fire.
+        """
+        self.firing_prev[:] = self.firing
+        self.firing[:] = False
+        self.firing[np.asarray(fired, dtype=np.int64)] = True
+        self.connectome._spread(self.firing)
+        self.connectome.hebbian_update(self.firing_prev, self.firing, self.plasticity)
+        return fired
+
+    def make_k_cap(self):
+        """Create the k-cap assembly from the local top-k candidates of all workers."""
+        replies = self.connectome._broadcast(("cap", self.assemblie_size))
+        candidates = np.concatenate([candidates for candidates, _ in replies])
+        values = np.concatenate([values for _, values in replies])
+        winners = candidates[k_cap(values, self.assemblie_size)]
+        order = np.lexsort((winners, -self.incoming_fire[winners]))
+        return winners[order]
+
+    def assemblie_fire(self):
+        """Fire the k-cap assembly of the current incoming fire and return it."""
+        return self.fire(self.make_k_cap())
+
+    def reset(self):
+        """Reset the firing states, the incoming fire and the weights of all connections."""
+        self.firing[:] = False
+        self.firing_prev[:] = False
+        self.connectome.incoming_fire[:] = 0
+        self.connectome.partial[:] = 0
+        self.connectome.reset()
+
+    def weights(self):
+        """Return a copy of the weights of all connections."""
+        return self.connectome.weights.copy()
+
+    def close(self):
+        """Stop the worker processes and release the shared memory."""
+        self.connectome.close()
+
+
+def _release(segments, processes, connections):
+    """Stop the worker processes that are still running and unlink the shared memory of a ShardedConnectome."""
+    for connection in connections:
+        try:
+            connection.send(("stop",))
+        except OSError:
+            pass  # The worker has already exited
+        connection.close()
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+    for segment in segments:
+        try:
+            segment.close()
+        except BufferError:
+            pass  # An array still refers to the segment; its mapping goes away with the array
+        segment.unlink()
+    del segments[:], processes[:], connections[:]
+
+
+def _attach(spec, segments):
+    """Attach to a shared array described by _spec_of."""
+    name, shape, dtype = spec
+    segment = shared_memory.SharedMemory(name=name)
+    segments.append(segment)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+
+
+def _draw_rows(spec):
+    """Draw the blocks of rows of a worker, in row order, each as (counts, indices, weights)."""
+    vertice_probability, seed, allow_self_connections, rows_per_block = spec["draw"]
+    lo, hi = spec["lo"], spec["hi"]
+    return [random_rows(spec["n_target"], vertice_probability, seed, first_row // rows_per_block, first_row,
+                        min(rows_per_block, hi - first_row), allow_self_connections)
+            for first_row in range(lo, hi, rows_per_block)]
+
+
+def _serve(spec, connection):
+    """
+    Worker loop of a ShardedConnectome.
+
+    :param spec: Shared buffers, the rows owned by this worker and how the connectome is drawn.
+    :param connection: Connection the commands are received on and replied to over.
+    """
+    segments = []
+    buffers = {name: _attach(value, segments) for name, value in spec["buffers"].items()}
+    worker, lo, hi = spec["worker"], spec["lo"], spec["hi"]
+    source_firing, target_firing = buffers["source_firing"], buffers["target_firing"]
+    partial, incoming_fire = buffers["partial"], buffers["incoming_fire"]
+
+    parts = _draw_rows(spec)
+    connection.send(np.concatenate([part[0] for part in parts]) if parts else np.zeros(0, dtype=np.int64))
+    rows = None
+
+    while True:
+        command = connection.recv()
+        if command[0] == "stop":
+            break
+
+        if command[0] == "store":
+            # Every block of rows is released once it is in shared memory, so the rows never exist twice
+            arrays = {name: _attach(value, segments) for name, value in command[1].items()}
+            indptr = arrays["indptr"]
+            start, end = int(indptr[lo]), int(indptr[hi])
+            position = start
+            while parts:
+                _, indices, weights = parts.pop(0)
+                arrays["indices"][position:position + indices.size] = indices
+                arrays["initial_weights"][position:position + indices.size] = weights
+                arrays["weights"][position:position + indices.size] = weights
+                position += indices.size
+            rows = Connectome(hi - lo, spec["n_target"], indptr[lo:hi + 1] - start, arrays["indices"][start:end],
+                              arrays["initial_weights"][start:end], arrays["weights"][start:end])
+            del arrays, indptr
+
+        elif command[0] == "propagate":
+            # Partial incoming fire caused by the firing neurons of this shard
+            partial[worker] = rows.propagate(source_firing[lo:hi])
+
+        elif command[0] == "hebbian":
+            # Hebbian update of the connections leaving the neurons of this shard that fired in the previous step
+            rows.hebbian_update(source_firing[lo:hi], target_firing, command[1])
+
+        elif command[0] == "cap":
+            # Incoming fire of the neurons of a square connectome numbered like the rows of this shard,
+            # and their local top-k candidates
+            incoming_fire[lo:hi] = partial[:, lo:hi].sum(axis=0)
+            local = k_cap(incoming_fire[lo:hi], command[1])
+            connection.send((local + lo, incoming_fire[lo + local]))
+            continue
+
+        connection.send(command[0])
+
+    del buffers, rows, source_firing, target_firing, partial, incoming_fire
+    for segment in segments:
+        segment.close()
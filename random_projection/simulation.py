@@ -0,0 +1,322 @@
+import random
+import logging
+from . import brain
+import math
+import time
+import queue
+import threading
+from .recorder import FiringRecorder
+
+
+class Snapshot:
+    def __init__(self, iteration, winners, weights, total_support, step_seconds):
+        """
+        Initialize an immutable Snapshot of the brain after one simulation step.
+
+        :param iteration: Number of steps taken so far.
+        :param winners: Dict of brain area ID to the tuple of IDs of the neurons that fired in the step.
+        :param weights: Dict of (source area ID, target area ID) to (edges, weights): the connections that
+                        may have changed in the step and their new weights, as read-only arrays.
+        :param total_support: Number of distinct neurons that have fired so far.
+        :param step_seconds: Time the step took in seconds.
+        """
+        for edges, values in weights.values():
+            edges.flags.writeable = False
+            values.flags.writeable = False
+        self.iteration = iteration
+        self.winners = winners
+        self.weights = weights
+        self.total_support = total_support
+        self.step_seconds = step_seconds
+        self.created = time.perf_counter()
+
+
+class SimulationWorker(threading.Thread):
+    def __init__(self, Brain, recorder, snapshots, step_interval=0.2):
+        """
+        Initialize a SimulationWorker, which advances the brain on a background thread and publishes
+        a Snapshot after every step.
+
+        :param Brain: The Brain to simulate.
+        :param recorder: The FiringRecorder attached to the brain.
+        :param snapshots: Bounded queue.Queue for the snapshots; the worker waits while it is full.
+        :param step_interval: Minimum time between two steps in seconds; feel free to change the timesteps.
+        """
+        super().__init__(daemon=True)
+        self.Brain = Brain
+        self.recorder = recorder
+        self.snapshots = snapshots
+        self.step_interval = step_interval
+        self.iteration = 0
+        self.throughput = 0.0  # Steps per second, exponentially averaged
+        self._stopped = threading.Event()
+
+    def stop(self):
+        """Stop the worker after the current step."""
+        self._stopped.set()
+
+    def step(self):
+        """
+        Fire the assemblies of all brain areas once and take a Snapshot of the result.
+
+        :return: The Snapshot of the step.
+        """
+        start = time.perf_counter()
+        areas = sorted(self.Brain.brain_areas, key=lambda area: area.ID)
+
+        # Fire the assemblies and update the state of neurons and connections
+        winners = {area.ID: tuple(neuron.neuron_ID for neuron in area.assemblie_fire()) for area in areas}
+        self.iteration += 1
+
+        # Only the connections leaving the previous winners can have changed their weight
+        weights = {}
+        for area in areas:
+            sources = area.firing_prev.nonzero()[0]
+            for target_area in area.target_areas():
+                edges, _, values = self.Brain.block(area, target_area).gather_edges(sources)
+                weights[(area.ID, target_area.ID)] = (edges, values)
+
+        return Snapshot(self.iteration, winners, weights, self.recorder.total_support(),
+                        time.perf_counter() - start)
+
+    def publish(self, snapshot):
+        """Put a Snapshot into the queue, waiting for the renderer while the queue is full."""
+        while not self._stopped.is_set():
+            try:
+                self.snapshots.put(snapshot, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def run(self):
+        last = time.perf_counter()
+        while not self._stopped.is_set():
+            start = time.perf_counter()
+            self.publish(self.step())
+            self._stopped.wait(max(0.0, self.step_interval - (time.perf_counter() - start)))
+
+            now = time.perf_counter()
+            rate = 1 / max(now - last, 1e-9)
+            self.throughput = rate if self.iteration == 1 else 0.8 * self.throughput + 0.2 * rate
+            last = now
+
+
+class simulation:
+    # Colors
+    WHITE = (255, 255, 255)
+    RED = (255, 0, 0)
+    BLACK = (0, 0, 0)
+    firsttime = True
+    # Display settings
+    WIDTH, HEIGHT = 600, 600
+    FPS = 30
+
+    def __init__(self, Brain, step_interval=0.2, queue_size=8):
+        """
+        Initialize the simulation with a Brain instance.
+
+        The brain is advanced by a SimulationWorker on a background thread. The window draws the
+        snapshots it publishes at its own frame rate and skips to the latest one when it falls behind.
+
+        :param Brain: The Brain to simulate.
+        :param step_interval: Minimum time between two simulation steps in seconds.
+        :param queue_size: Number of snapshots that may wait for the renderer.
+        """
+        self.Brain = Brain
+        self.iteration = 0
+        self.recorder = FiringRecorder()
+        self.Brain.attach_recorder(self.recorder)
+        self.step_interval = step_interval
+        self.snapshots = queue.Queue(maxsize=queue_size)
+        self.skipped_steps = 0
+        self.latency = 0.0  # Seconds from taking a snapshot to showing it, exponentially averaged
+        self.total_fired_neurons = 0
+        self.winners = {}
+        self.weights = {}
+
+    def initially(self):
+        """Initialize the positions and colors of brain areas and the weights the renderer draws."""
+        i = 0
+        n = int(round(math.sqrt(self.Brain.num_brain_areas)))
+        width_per_area = self.WIDTH // n
+        height_per_area = self.HEIGHT // n
+        for area in self.Brain.brain_areas:
+            area.color = (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))
+            area.position_x_upper = int((i % n) * width_per_area)
+            area.position_x_lower = int((((i) % n + 1)) * width_per_area) - 1
+            area.position_y_upper = int((i // n) * height_per_area)
+            area.position_y_lower = int(((i // n) + 1) * height_per_area) - 1
+            i += 1
+
+        # The renderer draws from its own copy of the weights, which the snapshots keep up to date
+        for area in self.Brain.brain_areas:
+            self.winners[area.ID] = ()
+            for target_area in area.target_areas():
+                block = self.Brain.block(area, target_area)
+                self.weights[(area.ID, target_area.ID)] = (block.indptr, block.indices, block.weights.copy())
+
+    def consume_snapshots(self):
+        """
+        Apply all published snapshots to the state the renderer draws, skipping to the latest one.
+
+        :return: The latest Snapshot, or None if no step has been published since the last frame.
+        """
+        latest = None
+        while True:
+            try:
+                snapshot = self.snapshots.get_nowait()
+            except queue.Empty:
+                break
+            for key, (edges, values) in snapshot.weights.items():
+                self.weights[key][2][edges] = values
+            if latest is not None:
+                self.skipped_steps += 1
+            latest = snapshot
+
+        if latest is not None:
+            self.iteration = latest.iteration
+            self.winners = latest.winners
+            self.total_fired_neurons = latest.total_support
+        return latest
+
+    def connections(self, area, firing_only=False):
+        """
+        Yield the connections leaving the neurons of a brain area, as drawn by the renderer.
+
+        :param area: The brain area.
+        :param firing_only: Only yield the connections leaving the winners of the latest snapshot.
+        :return: Generator of (neuronA, neuronB, weight).
+        """
+        winners = set(self.winners.get(area.ID, ()))
+        for target_area in area.target_areas():
+            indptr, indices, weights = self.weights[(area.ID, target_area.ID)]
+            for neuron in area.neurons:
+                if firing_only and neuron.neuron_ID not in winners:
+                    continue
+                for edge in range(indptr[neuron.neuron_ID], indptr[neuron.neuron_ID + 1]):
+                    yield neuron, target_area.neurons[indices[edge]], weights[edge]
+
+    def run_simulation(self):
+
+        """Run the simulation, visualizing the brain areas, neurons, and their connections."""
+        import pygame
+
+        screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
+        pygame.display.set_caption("Brain Simulation")
+
+        running = True
+        screen.fill(self.WHITE)
+
+        font = pygame.font.SysFont('arial', 18)
+        clock = pygame.time.Clock()
+
+        # Initialize the positions of neurons within their respective brain areas
+        for area in self.Brain.brain_areas:
+            for neuron in area.neurons:
+                neuron.x_pos = random.randint(area.position_x_upper, area.position_x_lower)
+                neuron.y_pos = random.randint(area.position_y_upper, area.position_y_lower)
+                pygame.draw.circle(screen, area.color, (neuron.x_pos, neuron.y_pos), 2)  # Made the dots a bit bigger
+
+        worker = SimulationWorker(self.Brain, self.recorder, self.snapshots, self.step_interval)
+        worker.start()
+        start_time = time.time()
+
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+
+            latest = self.consume_snapshots()
+
+            screen.fill(self.WHITE)
+
+            if(self.firsttime):
+                for area in self.Brain.brain_areas:
+                    for neuron, neuronB, weight in self.connections(area):
+                        thickness = min(15, max(1, int(weight * 2.1)))  # Scale thickness with weight
+                        pygame.draw.line(screen, (
+                        min(255, int(weight * 40)), 230 - min(230, int(weight * 50)),
+                        200 - min(200, int(weight * 20))),
+                                         (neuron.x_pos, neuron.y_pos),
+                                         (neuronB.x_pos, neuronB.y_pos), thickness)
+
+            # Draw neurons and represent their firing state with color and size
+            for area in self.Brain.brain_areas:
+                winners = set(self.winners.get(area.ID, ()))
+                for neuron in area.neurons:
+                    firing = neuron.neuron_ID in winners
+                    color = self.RED if firing else area.color
+                    radius = 5 if firing else 2  # Made the dots a bit bigger
+                    pygame.draw.circle(screen, color, (neuron.x_pos, neuron.y_pos), radius)
+                    pygame.draw.circle(screen, self.BLACK, (neuron.x_pos, neuron.y_pos), radius, 1)  # Added shadow
+
+            # Draw updated connections on top
+            for area in self.Brain.brain_areas:
+                for neuron, neuronB, weight in self.connections(area, firing_only=True):
+                    thickness = min(15, max(1, int(weight * 2.1)))  # Scale thickness with weight
+                    pygame.draw.line(screen, (min(255, int(weight * 40)), 255 - min(255, int(weight * 50)),
+                    255 - min(255, int(weight * 20))),
+                    (neuron.x_pos, neuron.y_pos),
+                    (neuronB.x_pos, neuronB.y_pos), thickness)
+
+            # Display dynamic information
+            elapsed_time = time.time() - start_time
+            info_texts = [
+                f'Iteration: {self.iteration}',
+                f'Total Activated Neurons: {self.total_fired_neurons}',
+                f'Number of Brain Areas: {len(self.Brain.brain_areas)}',
+                f'Number of Neurons: {len(self.Brain.brain_areas) * self.Brain.neurons_per_area}',
+                f'Assemblie Size: {self.Brain.assemblie_size}',
+                f'Elapsed Time: {elapsed_time:.2f} seconds',
+                f'Plasticity: {self.Brain.plasticity}',
+                f'Throughput: {worker.throughput:.1f} steps/s',
+                f'UI Latency: {self.latency * 1000:.0f} ms',
+                f'Skipped Steps: {self.skipped_steps}'
+            ]
+            y_pos = 10
+            info_box_height = len(info_texts) * 20 + 20  # Calculate the height of the info box
+            pygame.draw.rect(screen, self.WHITE, (5, 5, 250, info_box_height))  # Filled white rectangle
+            pygame.draw.rect(screen, self.BLACK, (5, 5, 250, info_box_height), 2)  # Black border
+            for info_text in info_texts:
+                rendered_text = font.render(info_text, True, self.BLACK)
+                screen.blit(rendered_text, (10, y_pos))
+                y_pos += 20
+
+            pygame.display.flip()
+            if latest is not None:
+                self.latency = 0.8 * self.latency + 0.2 * (time.perf_counter() - latest.created)
+
+            # The frame rate does not depend on the cost of a step, which runs on the worker
+            clock.tick(self.FPS)
+
+        worker.stop()
+        worker.join()
+        pygame.quit()
+
+
+def main(seed=52, num_brain_areas=1, neurons_per_area=60, vertice_probability=0.05, assemblie_size=6,
+         plasticity=0.3, area_vertice_probability=0.3, step_interval=0.2):
+    """
+    Initialize the simulation and open its window.
+    Feel free to change the values for different observations
+    """
+    import pygame
+
+    pygame.init()
+    random.seed(seed)  # The colours and positions of the neurons are drawn from the global random state
+    Brain = brain.Brain(seed=seed,
+                        num_brain_areas=num_brain_areas,
+                        neurons_per_area=neurons_per_area,
+                        vertice_probability=vertice_probability,
+                        assemblie_size=assemblie_size,
+                        plasticity=plasticity,
+                        area_vertice_probability=area_vertice_probability
+                        )
+    sim = simulation(Brain, step_interval=step_interval)
+    sim.initially()
+    sim.run_simulation()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
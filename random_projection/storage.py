@@ -0,0 +1,347 @@
+import json
+import os
+
+import numpy as np
+
+from .connectome import Connectome, ROWS_PER_BLOCK, batch_bincount
+
+FIELDS = {"indices": np.int32, "initial_weights": np.float64, "weights": np.float64}
+
+
+class MappedConnectome(Connectome):
+    def __init__(self, directory, page_edges=1 << 16, max_dirty_pages=256, coalesce_edges=1 << 12):
+        """
+        Open a MappedConnectome, a connectome whose connections are kept in memory-mapped files.
+
+        The row pointers are one file; the target neurons, the initial weights and the weights are split
+        into chunk files of a fixed number of connections. Propagation and the Hebbian update only read the
+        rows of the firing neurons, merged into large sequential reads. Changed weights are kept in dirty
+        pages in memory and written back to the chunk files on checkpoint, or when there are too many.
+
+        :param directory: Directory created by MappedConnectome.create or MappedConnectome.random.
+        :param page_edges: Number of connections per weight page.
+        :param max_dirty_pages: Number of dirty weight pages kept in memory before they are written back.
+        :param coalesce_edges: Rows whose connections are at most this many connections apart are read in one read.
+        """
+        with open(os.path.join(directory, "meta.json")) as file:
+            meta = json.load(file)
+        self.directory = directory
+        self.meta = meta
+        self.n_source = meta["n_source"]
+        self.n_target = meta["n_target"]
+        self.chunk_edges = meta["chunk_edges"]
+        self._num_connections = meta["num_connections"]
+        self.page_edges = page_edges
+        self.max_dirty_pages = max_dirty_pages
+        self.coalesce_edges = coalesce_edges
+
+        self.indptr = np.load(os.path.join(directory, "indptr.npy"), mmap_mode="r")
+        self.chunks = {field: [np.memmap(path, dtype=dtype, mode="r+" if field == "weights" else "r")
+                               for path in _chunk_paths(directory, field, meta["num_chunks"])]
+                       for field, dtype in FIELDS.items()}
+        self.dirty = {}
+        self.incoming_totals = None
+        self._initial_incoming_totals = None
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    @classmethod
+    def create(cls, directory, connectome, chunk_edges=1 << 22, **options):
+        """
+        Write an in-memory connectome to a directory and open it.
+
+        :param directory: Directory the files are written to.
+        :param connectome: Connectome with one weight per connection.
+        :param chunk_edges: Number of connections per chunk file.
+        """
+        writer = _ChunkWriter(directory, chunk_edges)
+        writer.append(connectome.indices, connectome.initial_weights, connectome.weights)
+        writer.close(connectome.n_source, connectome.n_target, np.asarray(connectome.indptr))
+        return cls(directory, **options)
+
+    @classmethod
+    def random(cls, directory, n_source, n_target, vertice_probability, seed, allow_self_connections=True,
+               rows_per_block=ROWS_PER_BLOCK, chunk_edges=1 << 22, workers=1, **options):
+        """
+        Generate a random connectome straight into a directory, one block of rows at a time, and open it.
+
+        Every block of rows is drawn from its own random stream derived from the seed, so the memory needed
+        is bounded by a few blocks per worker, and the connections are the same as those of Connectome.random.
+        The parameters are kept with the files, so that matches can tell which connectome they hold.
+
+        :param directory: Directory the files are written to.
+        :param n_source: Number of neurons the connections start from.
+        :param n_target: Number of neurons the connections end in.
+        :param vertice_probability: Probability of creating a connection between two neurons.
+        :param seed: Seed for random number generator.
+        :param allow_self_connections: False for connections within one area.
+        :param rows_per_block: Number of rows generated at once.
+        :param chunk_edges: Number of connections per chunk file.
+        :param workers: Number of worker processes drawing the blocks of rows.
+        """
+        from .construction import random_row_blocks
+
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        writer = _ChunkWriter(directory, chunk_edges)
+        indptr = np.zeros(n_source + 1, dtype=np.int64)
+        spec = (n_source, n_target, vertice_probability, seed, allow_self_connections)
+        for first_row, counts, indices, weights in random_row_blocks(spec, workers, rows_per_block):
+            indptr[first_row + 1:first_row + counts.size + 1] = indptr[first_row] + np.cumsum(counts)
+            writer.append(indices, weights, weights)
+        writer.close(n_source, n_target, indptr, random=_random_parameters(vertice_probability, seed,
+                                                                           allow_self_connections, rows_per_block))
+        return cls(directory, **options)
+
+    def matches(self, n_source, n_target, vertice_probability, seed, allow_self_connections=True,
+                rows_per_block=ROWS_PER_BLOCK):
+        """
+        Whether the files hold the connectome MappedConnectome.random generates with the given parameters.
+
+        :return: False if the parameters differ or the files were not written by MappedConnectome.random.
+        """
+        return (self.n_source == n_source and self.n_target == n_target and self.meta.get("random")
+                == _random_parameters(vertice_probability, seed, allow_self_connections, rows_per_block))
+
+    @property
+    def num_connections(self):
+        """Number of connections in the connectome."""
+        return self._num_connections
+
+    @property
+    def nbytes(self):
+        """Memory used by the dirty weight pages in bytes; everything else is only mapped."""
+        return sum(page.nbytes for page in self.dirty.values())
+
+    def propagate(self, active):
+        """
+        Compute the incoming fire of every target neuron when the active source neurons fire.
+
+        :param active: Boolean array of length n_source, or of shape (batch, n_source) with one firing pattern per row.
+        :return: Incoming fire of shape (n_target,) or (batch, n_target).
+        """
+        if active.ndim == 2:
+            edges, targets, weights = self.gather_edges(np.flatnonzero(active.any(axis=0)))
+            origin = np.searchsorted(self.indptr, edges, side="right") - 1
+            return batch_bincount(targets, origin, weights, active, self.n_target)
+
+        targets, weights = [], []
+        for start, end, selected in self._spans(np.flatnonzero(active)):
+            targets.append(self._read("indices", start, end)[selected])
+            weights.append(self._weights(start, end)[selected])
+        if not targets:
+            return np.zeros(self.n_target)
+        return np.bincount(np.concatenate(targets), weights=np.concatenate(weights), minlength=self.n_target)
+
+    def gather_edges(self, sources):
+        """
+        Gather the connections leaving the given source neurons.
+
+        :param sources: Sorted array of source neuron indices.
+        :return: (edges, targets, weights): the connection indices, their target neurons and a copy of their weights.
+        """
+        edges, targets, weights = [], [], []
+        for start, end, selected in self._spans(sources):
+            edges.append(start + np.flatnonzero(selected))
+            targets.append(self._read("indices", start, end)[selected])
+            weights.append(self._weights(start, end)[selected])
+        if not edges:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0)
+        return np.concatenate(edges), np.concatenate(targets), np.concatenate(weights)
+
+    def scatter_weights(self, edges, weights):
+        """Set the weights of the given sorted connections in their dirty pages."""
+        page_indices, first = np.unique(edges // self.page_edges, return_index=True)
+        for page_index, in_page, values in zip(page_indices, np.split(edges, first[1:]), np.split(weights, first[1:])):
+            self._dirty_page(page_index)[in_page - page_index * self.page_edges] = values
+        if len(self.dirty) > self.max_dirty_pages:
+            self.checkpoint()
+
+    def edge_weights(self, edges, initial=False):
+        """
+        Return the weights of the given connections, taking the dirty pages into account.
+
+        :param edges: Array of connection indices.
+        :param initial: Return the initial weights instead of the current ones.
+        """
+        edges = np.asarray(edges, dtype=np.int64)
+        weights = np.zeros(edges.size)
+        for i, edge in enumerate(edges):
+            if initial:
+                weights[i] = self._read("initial_weights", edge, edge + 1)[0]
+            else:
+                weights[i] = self._weights(edge, edge + 1)[0]
+        return weights
+
+    def incoming_weight_totals(self, initial=False):
+        """
+        Compute the sum of the incoming weights of every target neuron, one chunk at a time.
+
+        :param initial: Sum the initial weights instead of the current ones; this sum is computed only once.
+        """
+        if initial and self._initial_incoming_totals is not None:
+            return self._initial_incoming_totals
+        totals = np.zeros(self.n_target)
+        for start in range(0, self._num_connections, self.chunk_edges):
+            end = min(start + self.chunk_edges, self._num_connections)
+            weights = self._read("initial_weights", start, end) if initial else self._weights(start, end)
+            totals += np.bincount(self._read("indices", start, end), weights=weights, minlength=self.n_target)
+        if initial:
+            self._initial_incoming_totals = totals
+        return totals
+
+    def hebbian_update(self, prev_active, active, plasticity):
+        """
+        Strengthen every connection from a neuron that fired in the previous step to a neuron that fires now.
+
+        :param prev_active: Boolean firing pattern of the previous step over the source neurons.
+        :param active: Boolean firing pattern of the current step over the target neurons.
+        :param plasticity: The plasticity factor.
+        """
+        for start, end, selected in self._spans(np.flatnonzero(prev_active)):
+            selected &= active[self._read("indices", start, end)]
+            edges = start + np.flatnonzero(selected)
+            page_indices, first = np.unique(edges // self.page_edges, return_index=True)
+            for page_index, in_page in zip(page_indices, np.split(edges, first[1:])):
+                page = self._dirty_page(page_index)
+                page[in_page - page_index * self.page_edges] *= (1 + plasticity)
+        if len(self.dirty) > self.max_dirty_pages:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Write all dirty weight pages back to the chunk files and flush them to disk."""
+        for page_index, page in sorted(self.dirty.items()):
+            self._write("weights", page_index * self.page_edges, page)
+        for chunk in self.chunks["weights"]:
+            chunk.flush()
+        self.dirty.clear()
+
+    def reset(self):
+        """Reset the weights of all connections to their initial weights, one chunk at a time."""
+        self.dirty.clear()
+        self.incoming_totals = None
+        for initial, weights in zip(self.chunks["initial_weights"], self.chunks["weights"]):
+            weights[:] = initial
+            weights.flush()
+
+    def row_weights(self, source):
+        """Return the target neurons and the current weights of the connections leaving one source neuron."""
+        start, end = int(self.indptr[source]), int(self.indptr[source + 1])
+        return self._read("indices", start, end), self._weights(start, end)
+
+    def _spans(self, sources):
+        """
+        Merge the connection ranges of the given sorted source neurons into spans that are read at once.
+
+        :return: List of (start, end, selected): a range of connections and a mask of those that leave the sources.
+        """
+        if sources.size == 0:
+            return []
+        starts = np.asarray(self.indptr[sources], dtype=np.int64)
+        ends = np.asarray(self.indptr[sources + 1], dtype=np.int64)
+        breaks = np.flatnonzero(starts[1:] - ends[:-1] > self.coalesce_edges) + 1
+        spans = []
+        for group in np.split(np.arange(sources.size), breaks):
+            span_start, span_end = starts[group[0]], ends[group[-1]]
+            selected = np.zeros(span_end - span_start, dtype=bool)
+            for start, end in zip(starts[group], ends[group]):
+                selected[start - span_start:end - span_start] = True
+            spans.append((span_start, span_end, selected))
+        return spans
+
+    def _read(self, field, start, end):
+        """Read the connections start:end of a field from its chunk files in one sequential read per chunk."""
+        parts = []
+        for chunk, lo, hi in self._chunk_ranges(start, end):
+            parts.append(np.array(self.chunks[field][chunk][lo:hi]))
+        values = np.concatenate(parts) if parts else np.zeros(0, dtype=FIELDS[field])
+        self.bytes_read += values.nbytes
+        return values
+
+    def _write(self, field, start, values):
+        """Write values to the connections starting at start of a field."""
+        offset = 0
+        for chunk, lo, hi in self._chunk_ranges(start, start + values.size):
+            self.chunks[field][chunk][lo:hi] = values[offset:offset + hi - lo]
+            offset += hi - lo
+        self.bytes_written += values.nbytes
+
+    def _chunk_ranges(self, start, end):
+        """Split the connections start:end into (chunk, lo, hi) ranges within the chunk files."""
+        while start < end:
+            chunk, lo = divmod(start, self.chunk_edges)
+            hi = min(self.chunk_edges, lo + end - start)
+            yield chunk, lo, hi
+            start += hi - lo
+
+    def _weights(self, start, end):
+        """Read the current weights start:end, taking the dirty pages into account."""
+        weights = self._read("weights", start, end)
+        for page_index in range(start // self.page_edges, (end - 1) // self.page_edges + 1):
+            page = self.dirty.get(page_index)
+            if page is None:
+                continue
+            lo = page_index * self.page_edges
+            a, b = max(start, lo), min(end, lo + page.size)
+            weights[a - start:b - start] = page[a - lo:b - lo]
+        return weights
+
+    def _dirty_page(self, page_index):
+        """Return the dirty weight page with the given index, reading it from the chunk files if needed."""
+        page = self.dirty.get(page_index)
+        if page is None:
+            start = page_index * self.page_edges
+            page = self._read("weights", start, min(start + self.page_edges, self._num_connections))
+            self.dirty[page_index] = page
+        return page
+
+
+class _ChunkWriter:
+    def __init__(self, directory, chunk_edges):
+        """
+        Append connections to the chunk files of a MappedConnectome.
+
+        :param directory: Directory the files are written to.
+        :param chunk_edges: Number of connections per chunk file.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_edges = chunk_edges
+        self.written = 0
+        self.files = {}
+
+    def append(self, indices, initial_weights, weights):
+        """Append connections, starting new chunk files where the current ones are full."""
+        offset = 0
+        while offset < indices.size:
+            chunk, position = divmod(self.written, self.chunk_edges)
+            count = min(self.chunk_edges - position, indices.size - offset)
+            for field, values in (("indices", indices), ("initial_weights", initial_weights), ("weights", weights)):
+                path = _chunk_paths(self.directory, field, chunk + 1)[chunk]
+                with open(path, "ab" if position else "wb") as file:
+                    np.asarray(values[offset:offset + count], dtype=FIELDS[field]).tofile(file)
+            offset += count
+            self.written += count
+
+    def close(self, n_source, n_target, indptr, **description):
+        """
+        Write the row pointers and the description of the files.
+
+        :param description: Further entries of the description, for example how the connections were generated.
+        """
+        np.save(os.path.join(self.directory, "indptr.npy"), indptr)
+        num_chunks = -(-self.written // self.chunk_edges)
+        with open(os.path.join(self.directory, "meta.json"), "w") as file:
+            json.dump(dict({"n_source": n_source, "n_target": n_target, "num_connections": self.written,
+                            "chunk_edges": self.chunk_edges, "num_chunks": num_chunks}, **description), file)
+
+
+def _random_parameters(vertice_probability, seed, allow_self_connections, rows_per_block):
+    """The parameters of a random connectome as they are kept in meta.json."""
+    return {"vertice_probability": float(vertice_probability), "seed": np.asarray(seed).tolist(),
+            "allow_self_connections": bool(allow_self_connections), "rows_per_block": int(rows_per_block)}
+
+
+def _chunk_paths(directory, field, num_chunks):
+    """Paths of the chunk files of a field."""
+    return [os.path.join(directory, f"{field}_{chunk:05d}.bin") for chunk in range(num_chunks)]
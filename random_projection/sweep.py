@@ -0,0 +1,129 @@
+import numpy as np
+
+from .connectome import Connectome, k_cap
+from .incremental import IncrementalCap
+
+# An incremental cap saves the propagation and ranking over all neurons in every step, but still adds up the
+# connections leaving the cap. Measured on sweeps over a single plasticity value, it is faster once there are
+# this many neurons per connection leaving the cap; sweeps over several values are faster with one batched
+# propagation per step at any size
+MIN_NEURONS_PER_CAP_CONNECTION = 4
+
+
+class PlasticitySweep:
+    def __init__(self, connectome, plasticities, assemblie_size):
+        """
+        Initialize a sweep that runs one brain area for several plasticity values at once.
+
+        The topology of the area is shared by all plasticity values; each value only gets its own
+        weight column, so all of them advance in lockstep with one batched propagation per step.
+
+        :param connectome: Connectome of the connections within the brain area.
+        :param plasticities: The plasticity factors to compare.
+        :param assemblie_size: Size of the neuron assemblies.
+        """
+        self.plasticities = np.asarray(plasticities, dtype=float)
+        self.assemblie_size = assemblie_size
+        self.connectome = connectome.with_columns(len(self.plasticities))
+        self.n = connectome.n_source
+
+        shape = (len(self.plasticities), self.n)
+        self.firing = np.zeros(shape, dtype=bool)
+        self.firing_prev = np.zeros(shape, dtype=bool)
+        self.incoming_fire = np.zeros(shape)
+
+    @classmethod
+    def random(cls, seed, neurons_per_area, vertice_probability, plasticities, assemblie_size):
+        """
+        Create a sweep over a random brain area.
+
+        :param seed: Seed for random number generator.
+        :param neurons_per_area: Number of neurons in the brain area.
+        :param vertice_probability: Probability of creating connections between neurons.
+        :param plasticities: The plasticity factors to compare.
+        :param assemblie_size: Size of the neuron assemblies.
+        """
+        connectome = Connectome.random(neurons_per_area, neurons_per_area, vertice_probability, seed,
+                                       allow_self_connections=False)
+        return cls(connectome, plasticities, assemblie_size)
+
+    def reset(self):
+        """Reset the firing states, the incoming fire and the weights for all plasticity values."""
+        self.firing[:] = False
+        self.firing_prev[:] = False
+        self.incoming_fire[:] = 0
+        self.connectome.reset()
+
+    def fire(self, fired):
+        """
+        Fire one set of neurons per plasticity value and update the weights, like BrainArea.assemblie_fire_custom.
+
+        :param fired: Boolean array of shape (plasticities, n) marking the neurons that fire.
+        """
+        self.firing_prev = self.firing
+        self.firing = fired
+        self.incoming_fire = self.connectome.propagate(fired)
+        self.connectome.hebbian_update(self.firing_prev, self.firing, self.plasticities)
+
+    def make_k_caps(self):
+        """Create the k-cap assembly of every plasticity value, of shape (plasticities, assemblie_size)."""
+        return k_cap(self.incoming_fire, self.assemblie_size)
+
+    def _incremental_is_faster(self):
+        """Whether run_support is faster with an IncrementalCap than with one batched propagation per step."""
+        cap_connections = self.assemblie_size * self.connectome.num_connections / self.n
+        return len(self.plasticities) == 1 and self.n >= MIN_NEURONS_PER_CAP_CONNECTION * cap_connections
+
+    def run_support(self, stimulus, iterations):
+        """
+        Fire the stimulus together with the current k-cap repeatedly and track the total support,
+        the number of distinct neurons that have been in a k-cap so far.
+
+        :param stimulus: Indices of the neurons of the stimulus.
+        :param iterations: Number of times the stimulus and the k-cap are fired.
+        :return: Array of shape (plasticities, iterations + 1) with the total support after each iteration.
+        """
+        columns = len(self.plasticities)
+        rows = np.arange(columns)[:, None]
+        stimulus_mask = np.zeros((columns, self.n), dtype=bool)
+        stimulus_mask[:, stimulus] = True
+
+        support = np.zeros((columns, self.n), dtype=bool)
+        total_support = np.zeros((columns, iterations + 1), dtype=np.int64)
+        self.fire(stimulus_mask.copy())
+        caps = self.make_k_caps()
+        if not self._incremental_is_faster():
+            for iteration in range(1, iterations + 1):
+                fired = stimulus_mask.copy()
+                fired[rows, caps] = True
+                self.fire(fired)
+                support[rows, caps] = True
+                total_support[:, iteration] = support.sum(axis=1)
+                caps = self.make_k_caps()
+            return total_support
+
+        # Between the first and the last step the incoming fire is only updated by the neurons that
+        # entered or left the cap and by the weights that changed
+        index = IncrementalCap(self.connectome, self.assemblie_size, weights=self.connectome.weights[:, 0])
+        index.fire(self.firing[0])
+
+        for iteration in range(1, iterations + 1):
+            fired = stimulus_mask.copy()
+            fired[rows, caps] = True
+            support[rows, caps] = True
+            total_support[:, iteration] = support.sum(axis=1)
+            if iteration == iterations:
+                self.fire(fired)
+                break
+
+            self.firing_prev = self.firing
+            self.firing = fired
+            index.fire(fired[0])
+            caps = index.cap()[None]
+
+            edges, _ = self.connectome.row_edges(np.flatnonzero(self.firing_prev[0]))
+            before = self.connectome.weights[edges, 0]
+            self.connectome.hebbian_update(self.firing_prev, self.firing, self.plasticities)
+            changed = self.connectome.weights[edges, 0] != before
+            index.weights_changed(edges[changed], before[changed])
+        return total_support
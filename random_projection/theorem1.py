@@ -1,7 +1,6 @@
 import random
-import matplotlib.pyplot as plt
 import math
-from matplotlib.patches import Patch
+import logging
 
 
 
@@ -97,24 +96,29 @@ def random_projection(n,k,alpha,sparcity):
 
     return [n,k,alpha,expected, overlapp]
 
-def make_plot():
-    """Makes the Plot"""
-    n = 2000
-    k = 100
-    sparsity = 0.01
+def run_experiment(n=2000, k=100, sparsity=0.01, trials=3):
+    """
+    Computes the expected and the empirical overlap of the random projection for alpha from 0 to 1.
+
+    :param n: neurons called Kenyon cells
+    :param k: kinds of olfactory receptors
+    :param sparsity: sparsity of the bipartite graph
+    :param trials: number of independent trials averaged per alpha
+    :return: dict with the parameters and the lists alpha, expected_overlap and overlap
+    """
     alpha_list = []
     expected_overlap = []
     overlapp = []
 
     #gather the data for the plot
     for alpha in range(11):
-        print(alpha)
+        logging.info(f"alpha {alpha * 0.1:.1f}")
         kk =[]
         aa =[]
         ee =[]
         oo =[]
-        it=3
-        # Calculate the average of three independent trials
+        it=trials
+        # Calculate the average of independent trials
         for i in range(it):
             random.seed(i)
             vec = random_projection(n, k, alpha * 0.1, sparsity)
@@ -126,6 +130,18 @@ def make_plot():
         expected_overlap.append(sum(ee)/it)
         overlapp.append(sum(oo)/it)
 
+    return {"n": n, "k": k, "sparsity": sparsity, "trials": trials,
+            "alpha": alpha_list, "expected_overlap": expected_overlap, "overlap": overlapp}
+
+def make_plot(**parameters):
+    """Makes the Plot, passing the parameters on to run_experiment"""
+    import matplotlib.pyplot as plt
+
+    result = run_experiment(**parameters)
+    alpha_list = result["alpha"]
+    expected_overlap = result["expected_overlap"]
+    overlapp = result["overlap"]
+
     fig, ax = plt.subplots(figsize=(8, 6))
 
     # Assuming alpha_list is a list of x values, and expected_overlap and overlapp are y values
@@ -138,8 +154,10 @@ def make_plot():
     # Display the legend
     ax.legend()
 
-    plt.title('n=' + str(n)+' k='+ str(k)+ ' sparcity='+ str(sparsity))
+    plt.title('n=' + str(result["n"])+' k='+ str(result["k"])+ ' sparcity='+ str(result["sparsity"]))
     plt.show()
 
 
-make_plot()
\ No newline at end of file
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    make_plot()
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from random_projection.adaptive import AdaptiveSweep
+
+
+def noisy_trial(spreads):
+    """Trial whose result at a point is the point plus uniform noise of the point's spread."""
+    def trial(point, seed):
+        return point + spreads[point] * np.random.default_rng([point, seed]).uniform(-1, 1)
+    return trial
+
+
+def test_stops_at_the_budget():
+    sweep = AdaptiveSweep(noisy_trial({0: 1.0, 1: 1.0}), [0, 1], target_half_width=1e-6, max_trials=17)
+    sweep.run()
+    assert sweep.total_trials == 17
+
+
+def test_stops_at_the_target_half_width():
+    sweep = AdaptiveSweep(noisy_trial({0: 0.1, 1: 0.1}), [0, 1], target_half_width=0.05, max_trials=10000)
+    means, half_widths = sweep.run()
+    assert half_widths.max() <= 0.05
+    assert sweep.total_trials < 10000
+    assert np.allclose(means[:, 0], [0, 1], atol=0.1)
+
+
+def test_later_rounds_go_to_the_highest_variance_points():
+    spreads = {0: 0.0, 1: 0.001, 2: 1.0, 3: 0.001}
+    sweep = AdaptiveSweep(noisy_trial(spreads), [0, 1, 2, 3], initial_trials=3, trials_per_round=1,
+                          target_half_width=0.01, max_trials=40, curvature_weight=0)
+    sweep.run()
+    trials = sweep.trials
+    assert trials[2] == 40 - 3 * 3
+    assert list(trials[[0, 1, 3]]) == [3, 3, 3]
+
+
+def test_rejects_a_budget_below_the_initial_trials():
+    with pytest.raises(ValueError):
+        AdaptiveSweep(noisy_trial({0: 1.0}), [0, 1, 2], initial_trials=2, max_trials=5)
+    with pytest.raises(ValueError):
+        AdaptiveSweep(noisy_trial({0: 1.0}), [0], max_trials=0)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from random_projection.brain import Brain
+from random_projection.connectome import k_cap
+
+
+def make_brain(**parameters):
+    parameters = dict(dict(seed=2, num_brain_areas=2, neurons_per_area=500, vertice_probability=0.05, plasticity=0.1,
+                           assemblie_size=10, area_vertice_probability=1), **parameters)
+    brain = Brain(**parameters)
+    return brain, {area.ID: area for area in brain.brain_areas}
+
+
+def test_steps_only_create_the_neurons_of_the_k_cap():
+    brain, areas = make_brain()
+    areas[0].fire_indices(range(10))
+    caps = [areas[1].assemblie_fire() for _ in range(3)]
+    brain.fire_whole_brain()
+
+    assert areas[1]._all_neurons is None
+    assert set(areas[1]._neurons) == {neuron.neuron_ID for cap in caps for neuron in cap}
+    assert areas[1].make_k_cap(10)[0] is areas[1].neuron(areas[1].make_k_cap(10)[0].neuron_ID)
+    assert areas[1].neurons[caps[0][0].neuron_ID] is caps[0][0]
+
+    fired = {neuron.neuron_ID for cap in caps for neuron in cap} | set(np.flatnonzero(areas[1].firing))
+    assert set(np.flatnonzero(areas[1].fired_neurons)) == fired
+    brain.log_brain_stats()
+    brain.reset()
+    assert not areas[1].fired_neurons.any()
+
+
+def test_project_chain_matches_projecting_every_stimulus_alone():
+    brain, areas = make_brain(num_brain_areas=3)
+    stimuli = np.random.default_rng(1).permuted(np.tile(np.arange(500), (6, 1)), axis=1)[:, :10]
+    caps = brain.project_chain(stimuli, [0, 2, 1], recurrent_steps=2)
+
+    def active(cap):
+        fired = np.zeros(500, dtype=bool)
+        fired[cap] = True
+        return fired
+
+    assert np.array_equal(caps[0], stimuli)
+    for row, stimulus in enumerate(stimuli):
+        fired = active(stimulus)
+        for position, (source_ID, target_ID) in enumerate([(0, 2), (2, 1)], 1):
+            feedforward = brain.block(areas[source_ID], areas[target_ID]).propagate(fired)
+            steps = [k_cap(feedforward, 10)]
+            for _ in range(2):
+                recurrent = brain.block(areas[target_ID], areas[target_ID]).propagate(active(steps[-1]))
+                steps.append(k_cap(feedforward + recurrent, 10))
+            assert np.array_equal(caps[position][row], steps)
+            fired = active(steps[-1])
+
+    # Neither the firing state nor the weights were changed
+    assert not any(area.firing.any() or area.incoming_fire.any() for area in areas.values())
+    assert all(np.array_equal(block.weights, block.initial_weights) for block in brain.blocks.values())
+
+
+def test_project_chain_rejects_a_path_through_areas_that_are_not_neighbours():
+    brain, _ = make_brain(area_vertice_probability=0)
+    with pytest.raises(ValueError):
+        brain.project_chain([np.arange(10)], [0, 1])
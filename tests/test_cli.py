@@ -0,0 +1,20 @@
+import json
+
+import pytest
+
+from random_projection import cli
+
+
+def test_prints_the_result_as_json(capsys):
+    assert cli.main(["theorem3", "--n", "200", "--k", "10", "--points", "2", "--max-trials-per-point", "2"]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert result["alpha"] == [0.0, 1.0]
+
+
+def test_rejected_parameters_are_reported_without_a_traceback(capsys):
+    with pytest.raises(SystemExit) as exit:
+        cli.main(["theorem3", "--points", "1"])
+    assert exit.value.code == 2
+    error = capsys.readouterr().err
+    assert "theorem3: points must be at least 2, got 1" in error
+    assert "Traceback" not in error
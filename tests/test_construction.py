@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from random_projection.brain import Brain
+from random_projection.connectome import Connectome
+from random_projection.construction import random_connectomes
+from random_projection.storage import MappedConnectome
+
+SPECS = [(700, 500, 0.03, [3, 0, 0], False), (700, 500, 0.03, [3, 0, 1], True), (300, 900, 0.05, 7, True)]
+
+
+def assert_same_connectome(a, b):
+    assert (a.n_source, a.n_target) == (b.n_source, b.n_target)
+    assert np.array_equal(a.indptr, b.indptr)
+    assert a.indices.dtype == b.indices.dtype and np.array_equal(a.indices, b.indices)
+    assert np.array_equal(a.initial_weights, b.initial_weights)
+    assert np.array_equal(a.weights, b.weights)
+
+
+@pytest.mark.parametrize("workers", [2, 3, 8])
+def test_workers_give_bit_identical_connectomes(workers):
+    serial = random_connectomes(SPECS, workers=1, rows_per_block=64)
+    parallel = random_connectomes(SPECS, workers=workers, rows_per_block=64)
+    for a, b in zip(serial, parallel):
+        assert_same_connectome(a, b)
+
+
+def test_connectome_random_matches_mapped_random(tmp_path):
+    n_source, n_target, probability, seed, allow = SPECS[0]
+    connectome = Connectome.random(n_source, n_target, probability, seed, allow, rows_per_block=64)
+    mapped = MappedConnectome.random(str(tmp_path), n_source, n_target, probability, seed, allow,
+                                     rows_per_block=64, workers=2)
+    active = np.random.default_rng(0).random(n_source) < 0.05
+    assert np.array_equal(connectome.indptr, mapped.indptr)
+    assert np.array_equal(connectome.propagate(active), mapped.propagate(active))
+    assert not (connectome.indices[connectome.indptr[5]:connectome.indptr[6]] == 5).any()
+
+
+def test_brain_build_matches_lazy_blocks():
+    parameters = dict(seed=3, num_brain_areas=3, neurons_per_area=600, vertice_probability=0.03, plasticity=0.1,
+                      assemblie_size=10, area_vertice_probability=0.7)
+    built = Brain(**parameters)
+    built.build(workers=3)
+    lazy = Brain(**parameters)
+    areas = {area.ID: area for area in lazy.brain_areas}
+    assert len(built.blocks) > 3
+    for (source_ID, target_ID), block in built.blocks.items():
+        assert_same_connectome(block, lazy.block(areas[source_ID], areas[target_ID]))
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from random_projection import Theorem3, assemblie_overlap_plot
+from random_projection.brain import Brain
+from random_projection.ensemble import BrainEnsemble
+from random_projection.plasticity import Hebbian, Normalisation, WeightCap
+
+
+def areas_by_ID(standalone):
+    return {area.ID: area for area in standalone.brain_areas}
+
+
+def fire_stimulus(area, stimulus):
+    area.assemblie_fire_custom([area.neurons[neuron_ID] for neuron_ID in stimulus])
+
+
+@pytest.mark.parametrize("rules, area_vertice_probability", [
+    (lambda: None, 0.5),
+    (lambda: [Hebbian(0.2), Normalisation(), WeightCap(3)], 1.0),
+])
+def test_members_match_standalone_brains(rules, area_vertice_probability):
+    seeds, n, k = [5, 11, 12, 5], 200, 10
+    parameters = dict(num_brain_areas=3, neurons_per_area=n, vertice_probability=0.05, plasticity=0.2,
+                      assemblie_size=k, area_vertice_probability=area_vertice_probability)
+    Ensemble = BrainEnsemble(seeds, plasticity_rules=rules(), **parameters)
+    standalones = [Brain(seed=seed, plasticity_rules=rules(), **parameters) for seed in seeds]
+    rng = np.random.default_rng(0)
+    stimuli = np.array([rng.choice(n, k, replace=False) for _ in seeds])
+
+    for iteration in range(8):
+        active = np.ones(len(seeds), dtype=bool) if iteration < 2 else rng.random(len(seeds)) < 0.7
+        Ensemble.active[:] = active
+        Ensemble.brain_areas[0].assemblie_fire_custom(stimuli)
+        caps = [area.assemblie_fire() for area in Ensemble.brain_areas]
+        for member in np.flatnonzero(active):
+            areas = areas_by_ID(standalones[member])
+            fire_stimulus(areas[0], stimuli[member])
+            for ID in range(3):
+                assert [neuron.neuron_ID for neuron in areas[ID].assemblie_fire()] == list(caps[ID][member])
+
+    for member, standalone in enumerate(standalones):
+        for area in standalone.brain_areas:
+            assert np.array_equal(area.incoming_fire, Ensemble.brain_areas[area.ID].incoming_fire[member])
+            for target_area in area.target_areas():
+                block = Ensemble.block(Ensemble.brain_areas[area.ID], Ensemble.brain_areas[target_area.ID])
+                edges = slice(block.indptr[member * n], block.indptr[(member + 1) * n])
+                assert np.array_equal(standalone.block(area, target_area).weights, block.weights[edges])
+
+
+def test_theorem3_batch_matches_standalone_brains():
+    n, k = 300, 15
+    alphas, seeds = [0.0, 0.5, 1.0, 0.5], [0, 1, 0, 1]
+    results = Theorem3.run_batch(n, k, alphas, seeds)
+
+    for (overlap, expected), alpha, seed in zip(results, alphas, seeds):
+        standalone = Brain(seed=seed, num_brain_areas=2, neurons_per_area=n, vertice_probability=0.05,
+                       assemblie_size=k, plasticity=0.3, area_vertice_probability=1)
+        areas = areas_by_ID(standalone)
+        caps = []
+        for stimulus in Theorem3.make_stimuli(n, k, alpha, seed):
+            fire_stimulus(areas[0], stimulus)
+            caps.append(set(areas[1].make_k_cap(k)))
+            standalone.reset()
+        assert overlap == len(caps[0] & caps[1]) / k
+        assert expected == Theorem3.compute_expression(n, k, alpha)
+
+
+def test_overlap_batch_matches_standalone_brains():
+    n, k = 300, 15
+    overlaps, seeds = [0.2, 0.8, 0.2], [3, 4, 3]
+    results = assemblie_overlap_plot.run_batch(overlaps, seeds, n, k)
+
+    for (projection_overlap, assemblie_overlap), overlap_stimulus, seed in zip(results, overlaps, seeds):
+        standalone = Brain(seed=seed, num_brain_areas=2, neurons_per_area=n, vertice_probability=0.003,
+                       assemblie_size=k, area_vertice_probability=1, plasticity=0.1)
+        areas = areas_by_ID(standalone)
+        stimuli = assemblie_overlap_plot.make_stimuli(overlap_stimulus, seed, n, k)
+
+        caps = []
+        for stimulus in stimuli:
+            fire_stimulus(areas[0], stimulus)
+            caps.append(set(areas[1].make_k_cap(k)))
+            standalone.reset()
+        assert projection_overlap == len(caps[0] & caps[1]) / k
+
+        assemblies = []
+        for stimulus in stimuli:
+            winners = set()
+            while True:
+                before = len(winners)
+                fire_stimulus(areas[0], stimulus)
+                p = [neuron.neuron_ID for neuron in areas[0].assemblie_fire()]
+                q = [neuron.neuron_ID for neuron in areas[1].assemblie_fire()]
+                winners |= {(0, neuron_ID) for neuron_ID in p} | {(1, neuron_ID) for neuron_ID in q}
+                if len(winners) == before:
+                    break
+            assemblies.append(set(p))
+            standalone.reset()
+        assert assemblie_overlap == len(assemblies[0] & assemblies[1]) / k
+
+
+def test_members_with_the_same_seed_share_one_build(monkeypatch):
+    built = []
+    member_block = BrainEnsemble._member_block
+
+    def counting(self, seed, neighbours, key):
+        built.append((seed, key))
+        return member_block(self, seed, neighbours, key)
+
+    monkeypatch.setattr(BrainEnsemble, "_member_block", counting)
+    Ensemble = BrainEnsemble([0, 1] * 8, num_brain_areas=2, neurons_per_area=50, vertice_probability=0.1,
+                             plasticity=0.1, assemblie_size=5, area_vertice_probability=1)
+    area = Ensemble.brain_areas[0]
+    Ensemble.block(area, area)
+    assert sorted(built) == [(0, (0, 0)), (1, (0, 0))]
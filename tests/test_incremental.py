@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from random_projection import sweep
+from random_projection.brain import Brain
+from random_projection.connectome import Connectome, k_cap
+from random_projection.incremental import IncrementalCap
+from random_projection.sweep import PlasticitySweep
+
+
+@pytest.mark.parametrize("resync_interval", [3, 64])
+def test_cap_is_k_cap_of_propagated_fire_with_ties(resync_interval):
+    n, k = 400, 12
+    connectome = Connectome.random(n, n, 0.05, seed=7, allow_self_connections=False)
+    # Weights that are multiples of 0.5 give many neurons exactly the same incoming fire
+    connectome.weights = np.round(connectome.initial_weights * 2) / 2
+    index = IncrementalCap(connectome, k, resync_interval=resync_interval)
+    rng = np.random.default_rng(0)
+
+    previous = np.zeros(n, dtype=bool)
+    active = np.zeros(n, dtype=bool)
+    active[rng.choice(n, k, replace=False)] = True
+    for step in range(20):
+        index.fire(active)
+        assert np.array_equal(index.cap(), k_cap(connectome.propagate(active), k))
+
+        edges, _ = connectome.row_edges(np.flatnonzero(previous))
+        before = connectome.weights[edges]
+        connectome.hebbian_update(previous, active, 0.5)
+        changed = connectome.weights[edges] != before
+        index.weights_changed(edges[changed], before[changed])
+        assert np.array_equal(index.cap(), k_cap(connectome.propagate(active), k))
+
+        # Keep part of the firing neurons, as consecutive caps do
+        previous = active
+        active = np.zeros(n, dtype=bool)
+        active[rng.choice(np.flatnonzero(previous), k // 2, replace=False)] = True
+        active[rng.choice(np.flatnonzero(~previous), k - k // 2, replace=False)] = True
+
+
+def test_assemblie_fire_repeatedly_matches_assemblie_fire():
+    parameters = dict(seed=4, num_brain_areas=2, neurons_per_area=2000, vertice_probability=0.02, plasticity=0.2,
+                      assemblie_size=20, area_vertice_probability=1)
+    brains = [Brain(**parameters), Brain(**parameters)]
+    areas = [{area.ID: area for area in brain.brain_areas} for brain in brains]
+    for area in areas:
+        area[0].fire_indices(list(range(20)))
+
+    repeated = areas[0][0].assemblie_fire_repeatedly(30)
+    single = [[neuron.neuron_ID for neuron in areas[1][0].assemblie_fire()] for _ in range(30)]
+    assert np.array_equal(repeated, np.array(single))
+    for ID in range(2):
+        assert np.array_equal(areas[0][ID].incoming_fire, areas[1][ID].incoming_fire)
+        assert np.array_equal(areas[0][ID].firing, areas[1][ID].firing)
+    for key in brains[1].blocks:
+        source, target = areas[0][key[0]], areas[0][key[1]]
+        assert np.array_equal(brains[0].block(source, target).weights, brains[1].blocks[key].weights)
+
+
+def test_incremental_sweep_matches_batched_sweep(monkeypatch):
+    results = []
+    for minimum in (0, np.inf):
+        monkeypatch.setattr(sweep, "MIN_NEURONS_PER_CAP_CONNECTION", minimum)
+        Sweep = PlasticitySweep.random(seed=2, neurons_per_area=3000, vertice_probability=0.01, plasticities=[0.3],
+                                       assemblie_size=10)
+        assert Sweep._incremental_is_faster() == (minimum == 0)
+        support = Sweep.run_support(np.arange(10), 40)
+        results.append((support, Sweep.connectome.weights, Sweep.incoming_fire))
+    for incremental, batched in zip(*results):
+        assert np.array_equal(incremental, batched)
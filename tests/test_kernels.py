@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from random_projection import kernels
+from random_projection.brain import Brain, BrainArea
+from random_projection.connectome import Connectome
+
+
+@pytest.mark.parametrize("initial_weights", ["random", "ones"])
+def test_compiled_kernel_matches_numpy(initial_weights):
+    pytest.importorskip("numba")
+    connectome = Connectome.random(500, 500, 0.05, 4, allow_self_connections=False)
+    if initial_weights == "ones":
+        # Integer incoming fire, so that the cap is full of ties
+        connectome = Connectome(500, 500, connectome.indptr, connectome.indices, np.ones(connectome.num_connections))
+    states = []
+    for use_jit in (True, False):
+        block = Connectome(500, 500, connectome.indptr, connectome.indices, connectome.initial_weights)
+        incoming_fire = np.zeros(500)
+        incoming_fire[:20] = 1
+        firing, firing_prev = np.zeros(500, dtype=bool), np.zeros(500, dtype=bool)
+        caps = [kernels.assemblie_fire(block, incoming_fire, firing, firing_prev, 0.5, 25, use_jit=use_jit)
+                for _ in range(30)]
+        states.append((np.array(caps), block.weights, incoming_fire, firing, firing_prev))
+
+    for compiled, numpy in zip(*states):
+        assert np.array_equal(compiled, numpy)
+
+
+@pytest.mark.parametrize("vertice_probability", [0.05, 0.01])
+def test_area_fires_the_same_with_and_without_the_fused_kernel(monkeypatch, vertice_probability):
+    results = []
+    for fuse in (True, False):
+        monkeypatch.setattr(BrainArea, "_can_fuse", lambda self, fuse=fuse: fuse)
+        brain = Brain(seed=8, num_brain_areas=1, neurons_per_area=400, vertice_probability=vertice_probability,
+                      plasticity=0.1, assemblie_size=15, area_vertice_probability=1)
+        area = next(iter(brain.brain_areas))
+        area.assemblie_fire_custom(area.neurons[:15])
+        caps = [[neuron.neuron_ID for neuron in area.assemblie_fire()] for _ in range(20)]
+        results.append((caps, brain.block(area, area).weights, area.incoming_fire, area.firing, area.firing_prev))
+
+    assert results[0][0] == results[1][0]
+    for fused, unfused in zip(results[0][1:], results[1][1:]):
+        assert np.array_equal(fused, unfused)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from random_projection.brain import Brain
+from random_projection.connectome import Connectome
+from random_projection.plasticity import Fading, Hebbian, Normalisation, WeightCap, apply_rules
+
+# Source 0 -> targets 0, 1; source 1 -> targets 1, 2; source 2 -> target 0
+PREV_ACTIVE = np.array([True, False, True])
+ACTIVE = np.array([True, False, False])
+
+
+def make_connectome():
+    return Connectome(3, 3, np.array([0, 2, 4, 5]), np.array([0, 1, 1, 2, 0], dtype=np.int32),
+                      np.array([1.0, 2.0, 3.0, 6.0, 5.0]))
+
+
+@pytest.mark.parametrize("rule, expected", [
+    (Hebbian(0.5), [1.5, 2.0, 3.0, 6.0, 7.5]),
+    (Fading(1.0), [1.0, 1.0, 3.0, 6.0, 5.0]),
+    (Fading(0.25, minimum=1.8), [1.0, 1.8, 3.0, 6.0, 5.0]),
+    (WeightCap(4.0), [1.0, 2.0, 3.0, 6.0, 4.0]),
+])
+def test_rules_change_the_edges_leaving_the_previous_winners(rule, expected):
+    connectome = make_connectome()
+    step = apply_rules([rule], connectome, PREV_ACTIVE, ACTIVE)
+    assert list(step.edges) == [0, 1, 4]
+    assert np.allclose(connectome.weights, expected)
+    assert np.array_equal(connectome.initial_weights, [1.0, 2.0, 3.0, 6.0, 5.0])
+
+
+def test_normalisation_keeps_the_initial_incoming_totals():
+    connectome = make_connectome()
+    apply_rules([Hebbian(0.5), Normalisation()], connectome, PREV_ACTIVE, ACTIVE)
+    assert np.allclose(connectome.weights, connectome.initial_weights)
+    assert np.allclose(connectome.incoming_totals, [6.0, 5.0, 6.0])
+
+
+def test_normalisation_to_a_total():
+    connectome = make_connectome()
+    apply_rules([Hebbian(0.5), Normalisation(total=10.0)], connectome, PREV_ACTIVE, ACTIVE)
+    # Target 2 is not connected to a previous winner, so its connections are left alone
+    assert np.allclose(connectome.weights, [15 / 9, 7.0, 3.0, 6.0, 75 / 9])
+    assert np.allclose(connectome.incoming_weight_totals(), [10.0, 10.0, 6.0])
+    assert np.allclose(connectome.incoming_totals, connectome.incoming_weight_totals())
+
+
+def test_normalisation_over_many_steps():
+    connectome = Connectome.random(300, 200, 0.05, 1)
+    goal = connectome.incoming_weight_totals(initial=True)
+    rng = np.random.default_rng(2)
+    prev_active = rng.random(300) < 0.05
+    for _ in range(20):
+        active = np.zeros(200, dtype=bool)
+        active[rng.choice(200, 10, replace=False)] = True
+        before = connectome.weights.copy()
+        step = apply_rules([Hebbian(0.2), Normalisation()], connectome, prev_active, active)
+
+        changed = np.flatnonzero(connectome.weights != before)
+        assert np.isin(changed, step.edges).all()
+        assert np.allclose(connectome.incoming_weight_totals(), goal)
+        assert np.allclose(connectome.incoming_totals, goal)
+        prev_active = rng.random(300) < 0.05
+
+
+def test_fire_whole_brain_fades_the_unsuccessful_connections():
+    brain = Brain(seed=3, num_brain_areas=2, neurons_per_area=300, vertice_probability=0.05, plasticity=0.2,
+                  assemblie_size=10, area_vertice_probability=1)
+    areas = {area.ID: area for area in brain.brain_areas}
+    areas[0].assemblie_fire_custom([areas[0].neurons[i] for i in range(10)])
+    for _ in range(3):
+        brain.fire_whole_brain()
+
+    block = brain.block(areas[0], areas[0])
+    assert (block.weights < block.initial_weights).any()
+    assert (block.weights > block.initial_weights).any()
+    assert all((block.weights >= 1).all() for block in brain.blocks.values())
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from random_projection.brain import Brain
+from random_projection.recorder import FiringRecorder
+
+STEPS = [[0, 1, 2], [1, 2, 3], [1, 2, 3], [7, 8, 9], [], [0, 9]]
+
+
+def expected_raster(num_neurons=10):
+    raster = np.zeros((len(STEPS), num_neurons), dtype=bool)
+    for step, fired in enumerate(STEPS):
+        raster[step, fired] = True
+    return raster
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_raster_round_trip(tmp_path, spill):
+    recorder = FiringRecorder(spill_directory=str(tmp_path) if spill else None, steps_in_memory=4)
+    for fired in STEPS:
+        recorder.record(0, 10, fired)
+    assert recorder.steps(0) == len(STEPS)
+    assert np.array_equal(recorder.raster(0), expected_raster())
+    if spill:
+        # The first four steps were spilled when the buffer was full, the rest only on close
+        assert (tmp_path / "area_0.raster").stat().st_size == 4 * 2
+        recorder.close()
+        assert (tmp_path / "area_0.raster").stat().st_size == len(STEPS) * 2
+        assert np.array_equal(recorder.raster(0), expected_raster())
+
+
+def test_statistics():
+    recorder = FiringRecorder()
+    for fired in STEPS:
+        recorder.record(0, 10, fired)
+    recorder.record(1, 20, [15])
+
+    assert list(recorder.support_growth(0)) == [3, 4, 4, 7, 7, 7]
+    assert recorder.support_size(0) == 7
+    assert recorder.total_support() == 8
+    assert list(recorder.churn(0)) == [3, 1, 0, 3, 0, 2]
+    assert list(recorder.stability(0)) == [0.0, 2 / 3, 1.0, 0.0, 1.0, 0.0]
+    assert list(recorder.firing_counts(0)) == [2, 3, 3, 2, 0, 0, 0, 1, 1, 2]
+
+
+def test_second_recorder_does_not_overwrite_a_raster(tmp_path):
+    first = FiringRecorder(spill_directory=str(tmp_path))
+    first.record(0, 10, [1, 2])
+    first.close()
+    second = FiringRecorder(spill_directory=str(tmp_path))
+    with pytest.raises(FileExistsError):
+        second.record(0, 10, [3])
+    assert list(np.flatnonzero(first.raster(0)[0])) == [1, 2]
+
+
+def test_brain_records_every_step():
+    brain = Brain(seed=1, num_brain_areas=1, neurons_per_area=100, vertice_probability=0.1, plasticity=0.1,
+                   assemblie_size=5, area_vertice_probability=1)
+    recorder = FiringRecorder()
+    brain.attach_recorder(recorder)
+    Area = next(iter(brain.brain_areas))
+    Area.assemblie_fire_custom(Area.neurons[:5])
+    caps = [[neuron.neuron_ID for neuron in Area.assemblie_fire()] for _ in range(3)]
+    raster = recorder.raster(Area.ID)
+    assert raster.shape == (4, 100)
+    assert list(np.flatnonzero(raster[0])) == [0, 1, 2, 3, 4]
+    for step, cap in enumerate(caps, 1):
+        assert list(np.flatnonzero(raster[step])) == sorted(cap)
@@ -0,0 +1,58 @@
+import numpy as np
+
+from random_projection.brain import Brain
+from random_projection.connectome import Connectome, k_cap
+from random_projection.sharded import ShardedArea, ShardedConnectome
+
+
+def test_workers_draw_the_rows_of_connectome_random():
+    single = Connectome.random(3000, 3000, 0.01, [5, 0, 0], allow_self_connections=False, rows_per_block=256)
+    with ShardedConnectome(3000, 3000, 0.01, [5, 0, 0], allow_self_connections=False, workers=3,
+                           rows_per_block=256) as sharded:
+        assert np.array_equal(sharded.indptr, single.indptr)
+        assert np.array_equal(sharded.indices, single.indices)
+        assert np.array_equal(sharded.initial_weights, single.initial_weights)
+        active = np.random.default_rng(0).random(3000) < 0.02
+        assert np.allclose(sharded.propagate(active), single.propagate(active))
+
+
+def test_sharded_area_matches_a_single_process_connectome():
+    single = Connectome.random(3000, 3000, 0.01, 9, allow_self_connections=False, rows_per_block=256)
+    firing = np.zeros(3000, dtype=bool)
+    with ShardedArea(3000, 0.01, 9, assemblie_size=30, plasticity=0.1, workers=3, rows_per_block=256) as area:
+        cap = np.arange(30)
+        for _ in range(10):
+            area.fire(cap)
+            firing_prev, firing = firing, np.zeros(3000, dtype=bool)
+            firing[cap] = True
+            incoming_fire = single.propagate(firing)
+            single.hebbian_update(firing_prev, firing, 0.1)
+
+            cap = area.make_k_cap()
+            assert np.array_equal(cap, k_cap(incoming_fire, 30))
+            assert np.allclose(area.incoming_fire, incoming_fire)
+            assert np.array_equal(area.weights(), single.weights)
+
+
+def test_brain_with_shards_matches_a_brain_in_one_process():
+    parameters = dict(seed=4, num_brain_areas=2, neurons_per_area=3000, vertice_probability=0.01, plasticity=0.1,
+                      assemblie_size=30, area_vertice_probability=1)
+    standalone = Brain(**parameters)
+    sharded = Brain(**parameters, shards=3)
+    caps = []
+    for brain in (standalone, sharded):
+        areas = {area.ID: area for area in brain.brain_areas}
+        areas[0].assemblie_fire_custom([areas[0].neurons[i] for i in range(30)])
+        caps.append([[neuron.neuron_ID for neuron in areas[ID].assemblie_fire()] for _ in range(5) for ID in (0, 1)])
+    assert caps[0] == caps[1]
+    assert type(sharded.blocks[(0, 0)]) is ShardedConnectome and type(sharded.blocks[(0, 1)]) is Connectome
+    for key, block in standalone.blocks.items():
+        assert np.array_equal(sharded.blocks[key].weights, block.weights)
+
+    # An evicted sharded block releases its workers and comes back with its weights
+    weights = sharded.blocks[(1, 1)].weights.copy()
+    sharded.evict((1, 1))
+    areas = {area.ID: area for area in sharded.brain_areas}
+    assert np.array_equal(sharded.block(areas[1], areas[1]).weights, weights)
+    sharded.reset()
+    assert np.array_equal(sharded.blocks[(1, 1)].weights, sharded.blocks[(1, 1)].initial_weights)
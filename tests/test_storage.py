@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from random_projection.brain import Brain
+
+PARAMETERS = dict(seed=6, num_brain_areas=2, neurons_per_area=400, vertice_probability=0.05, plasticity=0.1,
+                  assemblie_size=10, area_vertice_probability=1)
+
+
+def all_weights(brain):
+    areas = {area.ID: area for area in brain.brain_areas}
+    weights = {}
+    for source in areas:
+        for target in areas:
+            block = brain.block(areas[source], areas[target])
+            weights[(source, target)] = block.edge_weights(np.arange(block.num_connections))
+    return weights
+
+
+def fire(brain, steps=4):
+    areas = {area.ID: area for area in brain.brain_areas}
+    areas[0].assemblie_fire_custom([areas[0].neurons[i] for i in range(10)])
+    return [[neuron.neuron_ID for neuron in areas[ID].assemblie_fire()] for _ in range(steps) for ID in (0, 1)]
+
+
+def test_stored_blocks_are_evicted_reset_and_reopened(tmp_path):
+    directory = tmp_path / "blocks"
+    in_memory = Brain(**PARAMETERS)
+    stored = Brain(**PARAMETERS, storage_directory=str(directory), memory_budget=0)
+    # Nothing has been stored yet, and unrelated files in the directory are left alone
+    stored.reset()
+    (directory / "notes.txt").write_text("not a block")
+
+    assert fire(stored) == fire(in_memory)
+    # Evicted blocks write their weights back and are opened again from their files
+    for key in list(stored.blocks):
+        stored.evict(key)
+    expected = all_weights(in_memory)
+    for key, weights in all_weights(stored).items():
+        assert np.array_equal(weights, expected[key])
+
+    stored.checkpoint()
+    reopened = Brain(**PARAMETERS, storage_directory=str(directory))
+    for key, weights in all_weights(reopened).items():
+        assert np.array_equal(weights, expected[key])
+
+    # Blocks that are not in memory are reset in their files
+    reopened.blocks.clear()
+    reopened.reset()
+    assert fire(reopened) == fire(Brain(**PARAMETERS))
+
+
+def test_blocks_of_other_parameters_are_rejected(tmp_path):
+    fire(Brain(**PARAMETERS, storage_directory=str(tmp_path)))
+    other = Brain(**dict(PARAMETERS, seed=7), storage_directory=str(tmp_path))
+    areas = {area.ID: area for area in other.brain_areas}
+    with pytest.raises(ValueError):
+        other.block(areas[0], areas[0])
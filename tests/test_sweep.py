@@ -0,0 +1,48 @@
+import numpy as np
+
+from random_projection.brain import Brain
+from random_projection.sweep import PlasticitySweep
+
+PLASTICITIES = [0, 0.01, 0.1, 0.5]
+
+
+def make_brain(plasticity):
+    return Brain(seed=1, num_brain_areas=1, neurons_per_area=400, vertice_probability=0.05, assemblie_size=10,
+                 area_vertice_probability=1, plasticity=plasticity)
+
+
+def run_brain(plasticity, stimulus, iterations):
+    """Total support of the stimulus fired together with its k-cap, with the loop of the original script."""
+    standalone = make_brain(plasticity)
+    Area = next(iter(standalone.brain_areas))
+    Stimulus = [Area.neurons[i] for i in stimulus]
+    Area.assemblie_fire_custom(Stimulus)
+    support = set()
+    plot = [0]
+    for _ in range(iterations):
+        k_cap = Area.make_k_cap(10)
+        Area.assemblie_fire_custom(list(set(Stimulus).union(set(k_cap))))
+        support.update(k_cap)
+        plot.append(len(support))
+    return plot, standalone.block(Area, Area).weights
+
+
+def make_sweep(plasticities):
+    standalone = make_brain(0)
+    Area = next(iter(standalone.brain_areas))
+    return PlasticitySweep(standalone.block(Area, Area), plasticities, 10)
+
+
+def test_every_column_matches_a_single_value_sweep_and_the_brain():
+    stimulus = np.random.default_rng(0).choice(400, 10, replace=False)
+    sweep = make_sweep(PLASTICITIES)
+    support = sweep.run_support(stimulus, 30)
+
+    for column, plasticity in enumerate(PLASTICITIES):
+        single = make_sweep([plasticity])
+        assert np.array_equal(single.run_support(stimulus, 30)[0], support[column])
+        assert np.array_equal(single.connectome.weights[:, 0], sweep.connectome.weights[:, column])
+
+        plot, weights = run_brain(plasticity, stimulus, 30)
+        assert list(support[column]) == plot
+        assert np.array_equal(weights, sweep.connectome.weights[:, column])